@@ -3,7 +3,7 @@ from .converter import convert_to_curves_with_ghostscript
 from .pdf2img import convert_pdf_to_images
 from .merger import merge_pdfs, merge_pdfs_with_ghostscript
 from .division import split_pdf
-from .utils import is_ghostscript_installed, is_pandoc_installed, convert_markdown_to_docx_with_pandoc, preprocess_markdown_for_pandoc, convert_image_to_pdf
+from .utils import is_ghostscript_installed, is_pandoc_installed, convert_markdown_to_docx_with_pandoc, preprocess_markdown_for_pandoc, convert_image_to_pdf, convert_images_to_pdf
 from .version import __version__
 from .add_bookmark import add_bookmarks_to_pdf, batch_add_bookmarks_to_pdfs
 
@@ -20,6 +20,7 @@ __all__ = [
     "convert_markdown_to_docx_with_pandoc",
     "preprocess_markdown_for_pandoc",
     "convert_image_to_pdf",
+    "convert_images_to_pdf",
     "__version__",
     "add_bookmarks_to_pdf",
     "batch_add_bookmarks_to_pdfs",
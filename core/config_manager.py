@@ -14,9 +14,51 @@ import uuid
 import logging
 
 from .config_models import APIConfig, ConfigProfile, ValidationResult, TestResult
+from .utils import get_http_client
+
+try:
+    import orjson
+except ImportError:  # orjson 为可选依赖，未安装时使用标准库 json
+    orjson = None
 
 logger = logging.getLogger(__name__)
 
+
+def _read_json_file(path) -> dict:
+    """读取 JSON 文件，优先使用 orjson 直接解析字节"""
+    if orjson is not None:
+        with open(path, 'rb') as f:
+            return orjson.loads(f.read())
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _write_json_file(path, data: dict):
+    """
+    以两空格缩进写入 JSON 文件，优先使用 orjson 直接序列化为字节。
+    先写入同目录下的临时文件并 fsync，再用 os.replace 原子替换目标文件，
+    写入中途出错或断电时不会留下只写了一半的文件。
+    """
+    if orjson is not None:
+        content = orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    else:
+        content = json.dumps(data, indent=2, ensure_ascii=False).encode('utf-8')
+    
+    tmp_path = f"{path}.tmp"
+    try:
+        with open(tmp_path, 'wb') as f:
+            f.write(content)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
 class ConfigManager:
     """配置管理核心类"""
     
@@ -33,16 +75,29 @@ class ConfigManager:
         # 确保目录存在
         self.config_dir.mkdir(exist_ok=True)
         self.backup_dir.mkdir(exist_ok=True)
+        
+        # 配置文件解析结果缓存: ((st_mtime_ns, st_size), 解析后的字典)
+        self._cache = None
     
     def load_configs(self) -> ConfigProfile:
-        """加载配置文件"""
-        if not self.config_file.exists():
+        """
+        加载配置文件。
+        文件的修改时间和大小未变化时直接使用缓存的解析结果，不再重复读盘和解析 JSON；
+        每次都返回新的 ConfigProfile 实例，调用方修改它不会影响缓存。
+        """
+        try:
+            st = os.stat(self.config_file)
+        except FileNotFoundError:
             # 尝试从旧的.env文件迁移配置
             return self._migrate_from_old_config()
         
         try:
-            with open(self.config_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            file_key = (st.st_mtime_ns, st.st_size)
+            if self._cache is not None and self._cache[0] == file_key:
+                data = self._cache[1]
+            else:
+                data = _read_json_file(self.config_file)
+                self._cache = (file_key, data)
             return ConfigProfile.from_dict(data)
         except Exception as e:
             logger.error(f"加载配置文件失败: {e}")
@@ -58,11 +113,15 @@ class ConfigManager:
             
             # 保存配置
             data = profile.to_dict()
-            with open(self.config_file, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
+            _write_json_file(self.config_file, data)
+            
+            # 刚写入的内容即为最新配置，直接更新缓存，下次加载无需重新解析
+            st = os.stat(self.config_file)
+            self._cache = ((st.st_mtime_ns, st.st_size), data)
             
             return True
         except Exception as e:
+            self._cache = None
             logger.error(f"保存配置文件失败: {e}")
             return False
     
@@ -87,8 +146,7 @@ class ConfigManager:
             else:
                 data = profile.to_dict()
             
-            with open(file_path, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
+            _write_json_file(file_path, data)
             
             return True
         except Exception as e:
@@ -98,8 +156,7 @@ class ConfigManager:
     def import_configs(self, file_path: str, merge: bool = True) -> List[APIConfig]:
         """从指定文件导入配置"""
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            data = _read_json_file(file_path)
             
             imported_profile = ConfigProfile.from_dict(data)
             current_profile = self.load_configs()
@@ -135,7 +192,6 @@ class ConfigManager:
     def test_connection(self, config: APIConfig) -> TestResult:
         """测试API连接"""
         import time
-        import httpx
         
         start_time = time.time()
         
@@ -163,23 +219,22 @@ class ConfigManager:
                     "Content-Type": "application/json"
                 }
                 
-                with httpx.Client(timeout=10.0) as client:
-                    response = client.get(
-                        f"{config.api_base_url.rstrip('/')}/models",
-                        headers=headers
-                    )
-                    response.raise_for_status()
-                    
-                    response_time = time.time() - start_time
-                    data = response.json()
-                    models = data.get("data", [])
-                    
-                    return TestResult(
-                        success=True,
-                        message="连接成功",
-                        response_time=response_time,
-                        details={"model_count": len(models)}
-                    )
+                response = get_http_client().get(
+                    f"{config.api_base_url.rstrip('/')}/models",
+                    headers=headers
+                )
+                response.raise_for_status()
+                
+                response_time = time.time() - start_time
+                data = response.json()
+                models = data.get("data", [])
+                
+                return TestResult(
+                    success=True,
+                    message="连接成功",
+                    response_time=response_time,
+                    details={"model_count": len(models)}
+                )
             
             else:
                 return TestResult(
@@ -218,8 +273,7 @@ class ConfigManager:
             if backups:
                 # 使用最新的备份
                 latest_backup = backups[-1]
-                with open(latest_backup, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
+                data = _read_json_file(latest_backup)
                 logger.info(f"从备份恢复配置: {latest_backup.name}")
                 return ConfigProfile.from_dict(data)
         except Exception as e:
@@ -3,6 +3,7 @@
 定义API配置的数据结构和验证逻辑
 """
 
+import copy
 from dataclasses import dataclass, field
 from datetime import datetime
 from typing import Dict, Any, Optional, List
@@ -12,6 +13,10 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+# 支持的API提供商与保存模式，验证时做集合成员判断
+SUPPORTED_PROVIDERS = frozenset({"OpenAI-Compatible", "Mistral API"})
+SUPPORTED_SAVE_MODES = frozenset({"per_page", "merged"})
+
 @dataclass
 class ValidationResult:
     """配置验证结果"""
@@ -64,7 +69,8 @@ class APIConfig:
             "is_default": self.is_default,
             "created_at": self.created_at.isoformat(),
             "updated_at": self.updated_at.isoformat(),
-            "extra_params": self.extra_params
+            # 复制嵌套字典，避免生成的字典（如 ConfigManager 的缓存）与本实例共享同一对象
+            "extra_params": copy.deepcopy(self.extra_params)
         }
     
     @classmethod
@@ -81,7 +87,9 @@ class APIConfig:
         config.prompt = data.get("prompt", config.prompt)
         config.save_mode = data.get("save_mode", config.save_mode)
         config.is_default = data.get("is_default", config.is_default)
-        config.extra_params = data.get("extra_params", config.extra_params)
+        if "extra_params" in data:
+            # 复制嵌套字典，修改实例不会改动来源字典（如 ConfigManager 缓存的解析结果）
+            config.extra_params = copy.deepcopy(data["extra_params"])
         
         # 处理时间字段
         if "created_at" in data:
@@ -107,7 +115,7 @@ class APIConfig:
         
         if not self.provider.strip():
             errors.append("API提供商不能为空")
-        elif self.provider not in ["OpenAI-Compatible", "Mistral API"]:
+        elif self.provider not in SUPPORTED_PROVIDERS:
             warnings.append(f"未知的API提供商: {self.provider}")
         
         if not self.api_key.strip():
@@ -122,7 +130,7 @@ class APIConfig:
         if not 0.0 <= self.temperature <= 2.0:
             warnings.append("温度参数应在0.0-2.0范围内")
         
-        if self.save_mode not in ["per_page", "merged"]:
+        if self.save_mode not in SUPPORTED_SAVE_MODES:
             warnings.append("保存模式应为'per_page'或'merged'")
         
         # 验证API Key格式
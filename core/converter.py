@@ -1,13 +1,13 @@
 import os
-import subprocess
-from .utils import _get_gs_executable, get_subprocess_startup_info, handle_exception, logger
+from .utils import _get_gs_executable, handle_exception, logger, remove_partial_output, run_ghostscript
 
 @handle_exception
-def convert_to_curves_with_ghostscript(input_path, output_path):
+def convert_to_curves_with_ghostscript(input_path, output_path, cancel_event=None):
     """
     使用 Ghostscript 将 PDF 文件中的文本转换为曲线。
     :param input_path: 输入 PDF 文件路径
     :param output_path: 输出 PDF 文件路径
+    :param cancel_event: 可选的 threading.Event，被设置时终止 Ghostscript 进程
     :return: dict 转换结果
     """
     gs_executable = _get_gs_executable()
@@ -25,16 +25,20 @@ def convert_to_curves_with_ghostscript(input_path, output_path):
         input_path
     ]
 
-    process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True, startupinfo=get_subprocess_startup_info())
-    _, stderr = process.communicate()
+    original_size = os.stat(input_path).st_size
 
-    if process.returncode != 0:
-        error_message = f"Ghostscript 转曲失败，返回码：{process.returncode}，错误信息：{stderr.strip()}"
+    returncode, stderr, cancelled = run_ghostscript(cmd, cancel_event)
+
+    if cancelled:
+        remove_partial_output(output_path)
+        return {"success": False, "cancelled": True, "message": "任务已取消"}
+
+    if returncode != 0:
+        error_message = f"Ghostscript 转曲失败，返回码：{returncode}，错误信息：{stderr.strip()}"
         logger.error(error_message)
         return {"success": False, "message": error_message}
 
-    original_size = os.path.getsize(input_path)
-    converted_size = os.path.getsize(output_path)
+    converted_size = os.stat(output_path).st_size
 
     return {
         "success": True,
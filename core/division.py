@@ -1,6 +1,6 @@
 import os
 import fitz  # PyMuPDF
-from .utils import handle_exception
+from .utils import handle_exception, throttle_progress
 
 @handle_exception
 def split_pdf(input_path, output_dir, progress_callback=None):
@@ -15,6 +15,7 @@ def split_pdf(input_path, output_dir, progress_callback=None):
     if not os.path.exists(output_dir):
         os.makedirs(output_dir)
 
+    progress_callback = throttle_progress(progress_callback)
     doc = fitz.open(input_path)
     page_count = len(doc)
     base_name, _ = os.path.splitext(os.path.basename(input_path))
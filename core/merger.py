@@ -1,6 +1,64 @@
+import contextlib
+import os
+import shutil
+import sys
+import tempfile
 import pikepdf
-import subprocess
-from .utils import _get_gs_executable, get_subprocess_startup_info, handle_exception, logger
+from concurrent.futures import ThreadPoolExecutor
+from .utils import _get_gs_executable, handle_exception, logger, remove_partial_output, run_ghostscript
+
+def _copy_single_pdf(input_path: str, output_path: str, progress_callback=None):
+    """
+    只有一个输入文件时直接复制，跳过 PDF 解析与重新序列化。
+
+    :param input_path: 唯一的输入 PDF 文件路径
+    :param output_path: 输出文件路径
+    :param progress_callback: 进度回调函数，接收 0-100 整数
+    :return: dict 合并结果
+    """
+    # shutil.copyfile 已按平台选用快速复制路径（如 Linux 上的 sendfile），无需自行实现内核态复制
+    shutil.copyfile(input_path, output_path)
+    if progress_callback:
+        progress_callback(100)
+    return {
+        "success": True,
+        "merged_files_count": 1,
+        "output_path": output_path,
+        "message": "PDF 合并成功！"
+    }
+
+def _prefetch_into_page_cache(paths):
+    """
+    提示操作系统预读输入文件到页缓存。
+    pikepdf 打开文件时只解析交叉引用表，各页内容流要到复制页面时才真正读取；
+    提前发出 POSIX_FADV_WILLNEED 提示可让内核在后台读盘，不占用进程内存也无需等待。
+    不支持 posix_fadvise 的平台（如 Windows）直接跳过，不额外启动读盘线程与合并争用磁盘。
+    :param paths: 去重后的输入文件路径列表
+    """
+    if not hasattr(os, "posix_fadvise"):
+        return
+    for path in paths:
+        try:
+            fd = os.open(path, os.O_RDONLY)
+        except OSError:
+            continue
+        try:
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED)
+        except OSError:
+            pass
+        finally:
+            os.close(fd)
+
+# 合并时同时打开、解析源文件的最大线程数
+_MERGE_OPEN_WORKERS = min(4, os.cpu_count() or 1)
+# 在当前追加位置之前最多提前打开的源文件数，限制同时打开的文件句柄与内存
+_MERGE_OPEN_AHEAD = 2 * _MERGE_OPEN_WORKERS
+
+def _close_pending_sources(pending):
+    """关闭已提前打开但尚未用完的源文件；打开失败的任务无需处理"""
+    for future in pending:
+        with contextlib.suppress(Exception):
+            future.result().close()
 
 @handle_exception
 def merge_pdfs(input_paths: list, output_path: str, progress_callback=None):
@@ -15,15 +73,46 @@ def merge_pdfs(input_paths: list, output_path: str, progress_callback=None):
     if not input_paths:
         return {"success": False, "message": "没有选择任何PDF文件进行合并。"}
 
+    if len(input_paths) == 1:
+        return _copy_single_pdf(input_paths[0], output_path, progress_callback)
+
     pdf = pikepdf.Pdf.new()
     total_files = len(input_paths)
+    last_percent = -1
+    # 同一文件被多次选择时只打开、解析一次：按规范化路径共用已打开的源文件，最后一次使用后再关闭
+    keys = [os.path.normcase(os.path.abspath(file_path)) for file_path in input_paths]
+    last_use = {key: i for i, key in enumerate(keys)}
+    _prefetch_into_page_cache(list(dict(zip(keys, input_paths)).values()))
     try:
-        for i, file_path in enumerate(input_paths):
-            if progress_callback:
-                progress_callback(int((i / total_files) * 100))
-            with pikepdf.open(file_path) as src:
+        with contextlib.ExitStack() as stack:
+            # 生产者：线程池在当前位置之前最多提前打开 _MERGE_OPEN_AHEAD 个位置上的源文件；
+            # 消费者：当前线程按原顺序取出并追加页面，某个源文件最后一次使用后立即关闭，输出只由当前线程写入
+            executor = stack.enter_context(
+                ThreadPoolExecutor(max_workers=min(_MERGE_OPEN_WORKERS, total_files))
+            )
+            opened = {}  # 规范化路径 -> 打开该源文件的 Future
+            stack.callback(_close_pending_sources, opened.values())
+            next_index = 0
+
+            for i in range(total_files):
+                while next_index < total_files and next_index < i + _MERGE_OPEN_AHEAD:
+                    key = keys[next_index]
+                    if key not in opened:
+                        opened[key] = executor.submit(pikepdf.open, input_paths[next_index])
+                    next_index += 1
+                if progress_callback:
+                    # 仅在百分比变化时回调，源文件再多也最多触发 100 次
+                    percent = i * 100 // total_files
+                    if percent != last_percent:
+                        progress_callback(percent)
+                        last_percent = percent
+                key = keys[i]
+                src = opened[key].result()
                 pdf.pages.extend(src.pages)
-        pdf.save(output_path)
+                if last_use[key] == i:
+                    del opened[key]
+                    src.close()
+            pdf.save(output_path)
     finally:
         pdf.close()
     if progress_callback:
@@ -35,6 +124,63 @@ def merge_pdfs(input_paths: list, output_path: str, progress_callback=None):
         "message": "PDF 合并成功！"
     }
 
+# Windows 上 CreateProcess 的命令行总长度上限为 32767 个字符；估算长度超过 32000 时改用 Ghostscript 的 @参数文件传递输入路径
+_GS_MAX_COMMAND_LENGTH = 32000
+
+# 在 Ghostscript 参数文件中有特殊含义的字符：双引号用于界定参数，反斜杠与换行影响参数的拆分
+_GS_ARGUMENT_FILE_SPECIAL_CHARS = frozenset('"\\\r\n')
+
+def _normalize_gs_input_path(path):
+    """Windows 下统一使用正斜杠（Ghostscript 同样接受），使普通路径不含参数文件中的特殊字符"""
+    if sys.platform == "win32":
+        return path.replace("\\", "/")
+    return path
+
+def _write_gs_argument_file(paths):
+    """
+    把输入文件路径写入 Ghostscript 参数文件（@file），每行一个带引号的路径。
+    路径中不能含有 _GS_ARGUMENT_FILE_SPECIAL_CHARS 中的字符，由调用方保证。
+    :param paths: 输入文件路径列表
+    :return: 参数文件路径，由调用方负责删除
+    """
+    fd, arg_file = tempfile.mkstemp(prefix="gs_merge_", suffix=".txt")
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        for path in paths:
+            f.write(f'"{path}"\n')
+    return arg_file
+
+def _build_gs_input_args(paths):
+    """
+    按原顺序生成输入文件的命令行参数：不含特殊字符的连续路径写入同一个 @参数文件，
+    含有特殊字符的路径直接作为命令行参数传入，无需依赖参数文件的转义规则。
+    :param paths: 输入文件路径列表
+    :return: (命令行参数列表, 已创建的参数文件列表)，参数文件由调用方负责删除
+    """
+    args = []
+    arg_files = []
+    group = []
+
+    def flush_group():
+        if group:
+            arg_file = _write_gs_argument_file(group)
+            arg_files.append(arg_file)
+            args.append(f"@{arg_file}")
+            group.clear()
+
+    try:
+        for path in map(_normalize_gs_input_path, paths):
+            if _GS_ARGUMENT_FILE_SPECIAL_CHARS.isdisjoint(path):
+                group.append(path)
+            else:
+                flush_group()
+                args.append(path)
+        flush_group()
+    except Exception:
+        for arg_file in arg_files:
+            remove_partial_output(arg_file)
+        raise
+    return args, arg_files
+
 @handle_exception
 def merge_pdfs_with_ghostscript(input_paths: list, output_path: str, progress_callback=None):
     """
@@ -48,6 +194,9 @@ def merge_pdfs_with_ghostscript(input_paths: list, output_path: str, progress_ca
     if not gs_executable:
         return {"success": False, "message": "未找到 Ghostscript 可执行文件，请安装 Ghostscript 并确保其在系统 PATH 中。"}
 
+    if len(input_paths) == 1:
+        return _copy_single_pdf(input_paths[0], output_path, progress_callback)
+
     cmd = [
         gs_executable,
         "-dBATCH",
@@ -55,13 +204,24 @@ def merge_pdfs_with_ghostscript(input_paths: list, output_path: str, progress_ca
         "-q",
         "-sDEVICE=pdfwrite",
         f"-sOutputFile={output_path}"
-    ] + input_paths
+    ]
+
+    # 所有输入始终由同一个 Ghostscript 进程合并；命令行过长时输入路径改经参数文件传入
+    arg_files = []
+    if sum(len(arg) + 3 for arg in cmd + input_paths) > _GS_MAX_COMMAND_LENGTH:
+        input_args, arg_files = _build_gs_input_args(input_paths)
+        cmd += input_args
+    else:
+        cmd += input_paths
 
-    process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True, startupinfo=get_subprocess_startup_info())
-    _, stderr = process.communicate()
+    try:
+        returncode, stderr, _ = run_ghostscript(cmd)
+    finally:
+        for arg_file in arg_files:
+            remove_partial_output(arg_file)
 
-    if process.returncode != 0:
-        error_message = f"Ghostscript 合并失败，返回码：{process.returncode}，错误信息：{stderr.strip()}"
+    if returncode != 0:
+        error_message = f"Ghostscript 合并失败，返回码：{returncode}，错误信息：{stderr.strip()}"
         logger.error(error_message)
         return {"success": False, "message": error_message}
 
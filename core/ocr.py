@@ -5,8 +5,8 @@ import json
 import os
 import re
 import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict, Any, Optional, Callable, Tuple
-from mistralai import Mistral
 
 from .utils import handle_exception, convert_markdown_to_docx_with_pandoc, preprocess_markdown_for_pandoc, is_pandoc_installed
 from .config_models import APIConfig
@@ -57,6 +57,215 @@ def encode_image_to_base64(image_path: str) -> Optional[Tuple[str, str]]:
     except Exception:
         return None
 
+def _save_page_docx(page_content: str, docx_path: str, page_number: int, logger: Any) -> None:
+    """将单页 Markdown 内容转换为 Word 文件，供后台线程调用"""
+    try:
+        processed_content = preprocess_markdown_for_pandoc(page_content)
+        conversion_result = convert_markdown_to_docx_with_pandoc(processed_content, docx_path)
+        if conversion_result["success"]:
+            logger.info(f"页面 {page_number} 的Word文件已保存: {docx_path}")
+        else:
+            logger.error(f"转换页面 {page_number} 的Word文件失败: {conversion_result['message']}")
+    except Exception as e:
+        logger.error(f"保存页面 {page_number} 的Word文件失败: {str(e)}")
+
+def _process_page(
+    image_path: str,
+    page_number: int,
+    total_images: int,
+    api_key: str,
+    model_name: str,
+    api_base_url: str,
+    prompt_text: str,
+    timeout: int,
+    logger: Any,
+    temperature: float,
+    progress_callback: Optional[Callable],
+    check_running: Callable,
+    base_name: Optional[str],
+    md_dir: Optional[str],
+    word_dir: Optional[str],
+    pandoc_executor: Optional[ThreadPoolExecutor],
+) -> str:
+    """识别单页图片并按需逐页保存结果，返回该页的 Markdown 内容
+
+    md_dir 为 None 时不逐页保存；Word 转换提交到 pandoc_executor 在后台执行。
+    """
+    if not check_running():
+        raise InterruptedError("OCR task was stopped.")
+
+    logger.info(f"正在处理第 {page_number}/{total_images} 页: {os.path.basename(image_path)}")
+
+    encode_result = encode_image_to_base64(image_path)
+    if not encode_result:
+        error_message = f"无法编码图片: {os.path.basename(image_path)}"
+        logger.error(f"页面 {page_number} 处理失败: {error_message}")
+        page_content = f"\n\n--- 页面 {page_number} 处理失败: {error_message} ---\n\n"
+        if progress_callback:
+            progress_callback(page_number, total_images, error_message, "")
+        return page_content
+
+    base64_image, mime_type = encode_result
+    file_size_mb = os.path.getsize(image_path) / (1024 * 1024)
+    data_uri_mb = len(f"data:{mime_type};base64,{base64_image}") / (1024 * 1024)
+    if mime_type != "image/png":
+        logger.info(f"页面 {page_number}: 原始图片 {file_size_mb:.1f}MB 超限，已压缩为 JPEG ({data_uri_mb:.1f}MB)")
+
+    payload = {
+        "model": model_name,
+        "messages": [
+            {
+                "role": "user",
+                "content": [
+                    {"type": "text", "text": prompt_text},
+                    {
+                        "type": "image_url",
+                        "image_url": {
+                            "url": f"data:{mime_type};base64,{base64_image}"
+                        }
+                    }
+                ]
+            }
+        ],
+        "temperature": temperature,  # 添加温度参数
+        "max_tokens": 4096,
+        "stream": True  # 启用流式输出
+    }
+
+    page_content = ""
+    max_retries = 3
+    retry_delay = 2
+    api_success = False
+
+    for attempt in range(max_retries):
+        if not check_running():
+            raise InterruptedError("OCR task was stopped.")
+
+        try:
+            logger.info(f"页面 {page_number}: 第 {attempt + 1} 次尝试调用API (流式模式)...")
+            page_content = ""  # 每次重试时重置内容
+
+            with httpx.Client(timeout=timeout) as client:
+                with client.stream(
+                    "POST",
+                    f"{api_base_url}/chat/completions",
+                    headers={
+                        "Content-Type": "application/json",
+                        "Authorization": f"Bearer {api_key}"
+                    },
+                    json=payload
+                ) as response:
+                    response.raise_for_status()
+
+                    for line in response.iter_lines():
+                        if not check_running():
+                            raise InterruptedError("OCR task was stopped.")
+
+                        if not line or line.strip() == "":
+                            continue
+
+                        # 处理 SSE 格式的数据
+                        line_str = line.strip()
+
+                        # 支持带或不带 "data: " 前缀的格式
+                        if line_str.startswith("data:"):
+                            data_str = line_str[5:].strip()  # 移除 "data:" 前缀
+                        else:
+                            data_str = line_str
+
+                        if data_str == "[DONE]":
+                            logger.info(f"页面 {page_number}: 收到流式结束标记 [DONE]")
+                            break
+
+                        if not data_str:
+                            continue
+
+                        try:
+                            chunk_data = json.loads(data_str)
+
+                            # 从流式响应中提取内容
+                            if "choices" in chunk_data and chunk_data["choices"]:
+                                delta = chunk_data["choices"][0].get("delta", {})
+                                content_chunk = delta.get("content", "")
+
+                                if content_chunk:
+                                    page_content += content_chunk
+
+                                    # 调用进度回调，实时更新流式内容
+                                    if progress_callback:
+                                        progress_callback(page_number, total_images, "流式输出中", page_content)
+
+                        except json.JSONDecodeError as je:
+                            # 记录无法解析的行，便于调试
+                            logger.debug(f"页面 {page_number}: 无法解析的流式数据: {data_str[:100]}...")
+                            continue
+
+            # 流式响应结束后检查内容
+            if page_content:
+                logger.info(f"页面 {page_number}: 第 {attempt + 1} 次尝试成功，内容长度: {len(page_content)} 字符。")
+                if progress_callback:
+                    progress_callback(page_number, total_images, "成功", page_content)
+                api_success = True
+                break
+            else:
+                logger.warning(f"页面 {page_number}: API返回了空的内容 (尝试 {attempt + 1}/{max_retries})。")
+                # 如果内容为空，继续重试
+                if attempt < max_retries - 1:
+                    time.sleep(retry_delay)
+                    continue
+                else:
+                    logger.warning(f"页面 {page_number}: API返回空内容，已达到最大重试次数 {max_retries}。")
+
+        except (httpx.HTTPStatusError, httpx.RequestError) as e:
+            error_message = f"API请求失败 (尝试 {attempt + 1}/{max_retries}): {str(e)}"
+            logger.warning(f"页面 {page_number}: {error_message}")
+            if progress_callback:
+                progress_callback(page_number, total_images, f"API请求失败 (尝试 {attempt + 1})", "")
+            if attempt < max_retries - 1:
+                time.sleep(retry_delay)
+            else:
+                final_error_message = f"API返回错误 (页面 {page_number}): {max_retries}次尝试后失败 - {str(e)}"
+                logger.error(f"页面 {page_number}: {final_error_message}")
+                page_content = f"\n\n--- {final_error_message} ---\n\n"
+                if progress_callback:
+                    progress_callback(page_number, total_images, "API 错误", "")
+
+        except Exception as e:
+            error_message = f"处理页面 {page_number} 时发生未知错误: {str(e)}"
+            logger.error(f"页面 {page_number}: {error_message}", exc_info=True)
+            page_content = f"\n\n--- {error_message} ---\n\n"
+            if progress_callback:
+                progress_callback(page_number, total_images, "未知错误", "")
+            break
+
+    if not api_success and not page_content:
+        error_message = f"页面 {page_number}: 所有重试均失败，未能获取OCR内容"
+        page_content = f"\n\n--- {error_message} ---\n\n"
+        logger.error(f"页面 {page_number}: {error_message}")
+
+    # 根据保存模式决定是否逐页保存结果
+    if md_dir:
+        # 保存Markdown文件
+        md_filename = f"{base_name}[P{page_number}].md"
+        md_path = os.path.join(md_dir, md_filename)
+        try:
+            with open(md_path, 'w', encoding='utf-8') as f:
+                f.write(page_content)
+            logger.info(f"页面 {page_number} 的Markdown已保存: {md_path}")
+        except Exception as e:
+            logger.error(f"保存页面 {page_number} 的Markdown失败: {str(e)}")
+
+        # 保存Word文件（如果安装了Pandoc）
+        if word_dir:
+            if pandoc_executor is not None:
+                docx_filename = f"{base_name}[P{page_number}].docx"
+                docx_path = os.path.join(word_dir, docx_filename)
+                pandoc_executor.submit(_save_page_docx, page_content, docx_path, page_number, logger)
+            else:
+                logger.warning("未安装Pandoc，跳过Word文件转换")
+
+    return page_content
+
 def _process_with_openai_compatible(
     image_paths: List[str],
     api_key: str,
@@ -113,192 +322,41 @@ def _process_with_openai_compatible(
         
         logger.info(f"使用保存模式: {save_mode}，基础名称: {base_name}")
 
-    for i, image_path in enumerate(image_paths):
-        if not check_running():
-            raise InterruptedError("OCR task was stopped.")
-            
-        logger.info(f"正在处理第 {i+1}/{total_images} 页: {os.path.basename(image_path)}")
-            
-        encode_result = encode_image_to_base64(image_path)
-        if not encode_result:
-            error_message = f"无法编码图片: {os.path.basename(image_path)}"
-            logger.error(f"页面 {i+1} 处理失败: {error_message}")
-            page_content = f"\n\n--- 页面 {i+1} 处理失败: {error_message} ---\n\n"
+    # 逐页的 Word 转换交给后台线程执行，Pandoc 的进程启动和转换耗时与后续页面的 OCR 请求重叠
+    pandoc_executor = None
+    if word_dir and is_pandoc_installed():
+        pandoc_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="pandoc")
+
+    # 仅在逐页保存模式且由 PDF 发起时逐页写出 Markdown 与 Word
+    page_md_dir = md_dir if save_mode == "per_page" and pdf_path and base_name else None
+
+    finished = False
+    try:
+        for i, image_path in enumerate(image_paths):
+            page_content = _process_page(
+                image_path,
+                page_number=i + 1,
+                total_images=total_images,
+                api_key=api_key,
+                model_name=model_name,
+                api_base_url=api_base_url,
+                prompt_text=prompt_text,
+                timeout=timeout,
+                logger=logger,
+                temperature=temperature,
+                progress_callback=progress_callback,
+                check_running=check_running,
+                base_name=base_name,
+                md_dir=page_md_dir,
+                word_dir=word_dir,
+                pandoc_executor=pandoc_executor,
+            )
             full_markdown_content.append(page_content)
-            if progress_callback:
-                progress_callback(i + 1, total_images, error_message, "")
-            continue
-
-        base64_image, mime_type = encode_result
-        file_size_mb = os.path.getsize(image_path) / (1024 * 1024)
-        data_uri_mb = len(f"data:{mime_type};base64,{base64_image}") / (1024 * 1024)
-        if mime_type != "image/png":
-            logger.info(f"页面 {i+1}: 原始图片 {file_size_mb:.1f}MB 超限，已压缩为 JPEG ({data_uri_mb:.1f}MB)")
-
-        payload = {
-            "model": model_name,
-            "messages": [
-                {
-                    "role": "user",
-                    "content": [
-                        {"type": "text", "text": prompt_text},
-                        {
-                            "type": "image_url",
-                            "image_url": {
-                                "url": f"data:{mime_type};base64,{base64_image}"
-                            }
-                        }
-                    ]
-                }
-            ],
-            "temperature": temperature,  # 添加温度参数
-            "max_tokens": 4096,
-            "stream": True  # 启用流式输出
-        }
-        
-        page_content = ""
-        max_retries = 3
-        retry_delay = 2
-        api_success = False
-
-        for attempt in range(max_retries):
-            if not check_running():
-                raise InterruptedError("OCR task was stopped.")
-            
-            try:
-                logger.info(f"页面 {i+1}: 第 {attempt + 1} 次尝试调用API (流式模式)...")
-                page_content = ""  # 每次重试时重置内容
-                
-                with httpx.Client(timeout=timeout) as client:
-                    with client.stream(
-                        "POST",
-                        f"{api_base_url}/chat/completions",
-                        headers={
-                            "Content-Type": "application/json",
-                            "Authorization": f"Bearer {api_key}"
-                        },
-                        json=payload
-                    ) as response:
-                        response.raise_for_status()
-                        
-                        for line in response.iter_lines():
-                            if not check_running():
-                                raise InterruptedError("OCR task was stopped.")
-                            
-                            if not line or line.strip() == "":
-                                continue
-                            
-                            # 处理 SSE 格式的数据
-                            line_str = line.strip()
-                            
-                            # 支持带或不带 "data: " 前缀的格式
-                            if line_str.startswith("data:"):
-                                data_str = line_str[5:].strip()  # 移除 "data:" 前缀
-                            else:
-                                data_str = line_str
-                            
-                            if data_str == "[DONE]":
-                                logger.info(f"页面 {i+1}: 收到流式结束标记 [DONE]")
-                                break
-                            
-                            if not data_str:
-                                continue
-                            
-                            try:
-                                chunk_data = json.loads(data_str)
-                                
-                                # 从流式响应中提取内容
-                                if "choices" in chunk_data and chunk_data["choices"]:
-                                    delta = chunk_data["choices"][0].get("delta", {})
-                                    content_chunk = delta.get("content", "")
-                                    
-                                    if content_chunk:
-                                        page_content += content_chunk
-                                        
-                                        # 调用进度回调，实时更新流式内容
-                                        if progress_callback:
-                                            progress_callback(i + 1, total_images, "流式输出中", page_content)
-                            
-                            except json.JSONDecodeError as je:
-                                # 记录无法解析的行，便于调试
-                                logger.debug(f"页面 {i+1}: 无法解析的流式数据: {data_str[:100]}...")
-                                continue
-
-                # 流式响应结束后检查内容
-                if page_content:
-                    logger.info(f"页面 {i+1}: 第 {attempt + 1} 次尝试成功，内容长度: {len(page_content)} 字符。")
-                    if progress_callback:
-                        progress_callback(i + 1, total_images, "成功", page_content)
-                    api_success = True
-                    break
-                else:
-                    logger.warning(f"页面 {i+1}: API返回了空的内容 (尝试 {attempt + 1}/{max_retries})。")
-                    # 如果内容为空，继续重试
-                    if attempt < max_retries - 1:
-                        time.sleep(retry_delay)
-                        continue
-                    else:
-                        logger.warning(f"页面 {i+1}: API返回空内容，已达到最大重试次数 {max_retries}。")
-                
-            except (httpx.HTTPStatusError, httpx.RequestError) as e:
-                error_message = f"API请求失败 (尝试 {attempt + 1}/{max_retries}): {str(e)}"
-                logger.warning(f"页面 {i+1}: {error_message}")
-                if progress_callback:
-                    progress_callback(i + 1, total_images, f"API请求失败 (尝试 {attempt + 1})", "")
-                if attempt < max_retries - 1:
-                    time.sleep(retry_delay)
-                else:
-                    final_error_message = f"API返回错误 (页面 {i+1}): {max_retries}次尝试后失败 - {str(e)}"
-                    logger.error(f"页面 {i+1}: {final_error_message}")
-                    page_content = f"\n\n--- {final_error_message} ---\n\n"
-                    if progress_callback:
-                        progress_callback(i + 1, total_images, "API 错误", "")
-
-            except Exception as e:
-                error_message = f"处理页面 {i+1} 时发生未知错误: {str(e)}"
-                logger.error(f"页面 {i+1}: {error_message}", exc_info=True)
-                page_content = f"\n\n--- {error_message} ---\n\n"
-                if progress_callback:
-                    progress_callback(i + 1, total_images, "未知错误", "")
-                break
-        
-        if not api_success and not page_content:
-            error_message = f"页面 {i+1}: 所有重试均失败，未能获取OCR内容"
-            page_content = f"\n\n--- {error_message} ---\n\n"
-            logger.error(f"页面 {i+1}: {error_message}")
-        
-        # 根据保存模式决定是否逐页保存结果
-        if save_mode == "per_page" and pdf_path and base_name and md_dir:
-            page_number = i + 1
-            
-            # 保存Markdown文件
-            md_filename = f"{base_name}[P{page_number}].md"
-            md_path = os.path.join(md_dir, md_filename)
-            try:
-                with open(md_path, 'w', encoding='utf-8') as f:
-                    f.write(page_content)
-                logger.info(f"页面 {page_number} 的Markdown已保存: {md_path}")
-            except Exception as e:
-                logger.error(f"保存页面 {page_number} 的Markdown失败: {str(e)}")
-            
-            # 保存Word文件（如果安装了Pandoc）
-            if word_dir:
-                if is_pandoc_installed():
-                    docx_filename = f"{base_name}[P{page_number}].docx"
-                    docx_path = os.path.join(word_dir, docx_filename)
-                    try:
-                        processed_content = preprocess_markdown_for_pandoc(page_content)
-                        conversion_result = convert_markdown_to_docx_with_pandoc(processed_content, docx_path)
-                        if conversion_result["success"]:
-                            logger.info(f"页面 {page_number} 的Word文件已保存: {docx_path}")
-                        else:
-                            logger.error(f"转换页面 {page_number} 的Word文件失败: {conversion_result['message']}")
-                    except Exception as e:
-                        logger.error(f"保存页面 {page_number} 的Word文件失败: {str(e)}")
-                else:
-                    logger.warning("未安装Pandoc，跳过Word文件转换")
-        
-        full_markdown_content.append(page_content)
+        finished = True
+    finally:
+        # 等待已提交的逐页 Word 转换完成；任务被停止或出错时取消尚未开始的转换，不在任务结束后继续写文件
+        if pandoc_executor is not None:
+            pandoc_executor.shutdown(wait=True, cancel_futures=not finished)
     
     # 如果使用了逐页保存模式，额外创建合并文件
     if save_mode == "per_page" and pdf_path and base_name and md_dir:
@@ -364,6 +422,8 @@ def _process_with_mistral(
         if progress_callback:
             progress_callback(1, 1, "正在准备文件...", "")
 
+        # mistralai SDK 体积较大，仅在实际使用 Mistral API 时导入
+        from mistralai import Mistral
         client = Mistral(api_key=api_key)
         
         logger.info("正在将PDF文件编码为Base64...")
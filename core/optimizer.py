@@ -1,43 +1,118 @@
 import os
 import pikepdf
-import subprocess
-from .utils import _get_gs_executable, get_subprocess_startup_info, handle_exception, logger
+import fitz  # PyMuPDF
+from .utils import _get_gs_executable, handle_exception, logger, remove_partial_output, run_ghostscript
+
+# pikepdf 质量预设：(compress_streams, object_stream_mode, linearize)
+_PIKEPDF_PRESETS = {
+    "低质量 (最大压缩)": (True, pikepdf.ObjectStreamMode.generate, False),
+    "中等质量 (推荐)": (True, pikepdf.ObjectStreamMode.generate, True),
+    "高质量 (轻度优化)": (False, pikepdf.ObjectStreamMode.disable, True),
+}
+_DEFAULT_PIKEPDF_PRESET = _PIKEPDF_PRESETS["高质量 (轻度优化)"]
+
+# Ghostscript 质量预设：-dPDFSETTINGS 取值
+_GS_PRESETS = {
+    "低质量 (最大压缩)": "/screen",
+    "中等质量 (推荐)": "/ebook",
+    "高质量 (轻度优化)": "/prepress",
+}
+_DEFAULT_GS_PRESET = "/ebook"
+
+# PyMuPDF 打开或保存文件失败时可能抛出的异常；新版 PyMuPDF 的 MuPDF 错误类型不继承 RuntimeError
+_PYMUPDF_ERRORS = (RuntimeError, OSError)
+_MUPDF_ERROR_BASE = getattr(getattr(fitz, "mupdf", None), "FzErrorBase", None)
+if _MUPDF_ERROR_BASE is not None:
+    _PYMUPDF_ERRORS += (_MUPDF_ERROR_BASE,)
+
+def _optimize_pdf_with_pymupdf(input_path, output_path, quality_preset):
+    """
+    使用 PyMuPDF 进行 PDF 优化：清理孤立对象、去重并以 deflate 重新压缩。
+    新版 PyMuPDF 不再支持线性化，清理结果再由 pikepdf 按质量预设写出（"中等质量 (推荐)" 会线性化输出）。
+    :param input_path: 输入 PDF 文件路径
+    :param output_path: 输出 PDF 文件路径
+    :param quality_preset: 质量预设字符串
+    :return: (原始大小, 优化后大小) 元组
+    """
+    original_size = os.stat(input_path).st_size
+    # PyMuPDF 的清理结果先写入输出旁的临时文件，大文件也不必整体放在内存中
+    cleaned_path = f"{output_path}.tmp"
+    try:
+        with fitz.open(input_path) as doc:
+            doc.save(
+                cleaned_path,
+                garbage=3,
+                deflate=True,
+                deflate_images=True,
+                deflate_fonts=True,
+                clean=True
+            )
+        compress_streams, object_stream_mode, linearize = _PIKEPDF_PRESETS.get(
+            quality_preset, _DEFAULT_PIKEPDF_PRESET
+        )
+        with pikepdf.open(cleaned_path) as pdf:
+            pdf.save(
+                output_path,
+                min_version=pdf.pdf_version,
+                object_stream_mode=object_stream_mode,
+                compress_streams=compress_streams,
+                linearize=linearize
+            )
+    finally:
+        remove_partial_output(cleaned_path)
+    return original_size, os.stat(output_path).st_size
+
+def _optimize_pdf_with_pikepdf(input_path, output_path, quality_preset):
+    """
+    使用 pikepdf 进行 PDF 优化。
+    :param input_path: 输入 PDF 文件路径
+    :param output_path: 输出 PDF 文件路径
+    :param quality_preset: 质量预设字符串
+    :return: (原始大小, 优化后大小) 元组
+    """
+    # 复用已打开文件句柄的 fstat 获取文件大小，避免额外的路径解析和 stat 调用
+    with open(input_path, "rb") as src, pikepdf.open(src) as pdf:
+        original_size = os.fstat(src.fileno()).st_size
+        # 根据质量预设设置压缩参数
+        compress_streams, object_stream_mode, linearize = _PIKEPDF_PRESETS.get(
+            quality_preset, _DEFAULT_PIKEPDF_PRESET
+        )
+
+        with open(output_path, "wb") as dst:
+            pdf.save(
+                dst,
+                min_version=pdf.pdf_version,
+                object_stream_mode=object_stream_mode,
+                compress_streams=compress_streams,
+                linearize=linearize
+            )
+            dst.flush()
+            optimized_size = os.fstat(dst.fileno()).st_size
+
+    return original_size, optimized_size
 
 @handle_exception
 def optimize_pdf(input_path, output_path, quality_preset, progress_callback=None):
     """
-    使用 pikepdf 进行 PDF 优化。
+    使用 pikepdf 进行 PDF 优化，输出是否线性化由质量预设决定（见 _PIKEPDF_PRESETS）。
+    "中等质量 (推荐)" 预设先由 PyMuPDF 清理无用对象并重新压缩，再由 pikepdf 线性化写出；
+    PyMuPDF 读写文件失败时直接由 pikepdf 优化原文件，输出同样是线性化的。
     :param input_path: 输入 PDF 文件路径
     :param output_path: 输出 PDF 文件路径
     :param quality_preset: 质量预设字符串，如 "低质量 (最大压缩)", "中等质量 (推荐)", "高质量 (轻度优化)"
     :param progress_callback: 进度回调函数，接收 0-100 整数
     :return: dict 优化结果
     """
-    with pikepdf.open(input_path) as pdf:
-        # 根据质量预设设置压缩参数
-        if quality_preset == "低质量 (最大压缩)":
-            compress_streams = True
-            object_stream_mode = pikepdf.ObjectStreamMode.generate
-            linearize = False
-        elif quality_preset == "中等质量 (推荐)":
-            compress_streams = True
-            object_stream_mode = pikepdf.ObjectStreamMode.generate
-            linearize = True
-        else:  # 高质量 (轻度优化)
-            compress_streams = False
-            object_stream_mode = pikepdf.ObjectStreamMode.disable
-            linearize = True
-
-        pdf.save(
-            output_path,
-            min_version=pdf.pdf_version,
-            object_stream_mode=object_stream_mode,
-            compress_streams=compress_streams,
-            linearize=linearize
-        )
+    sizes = None
+    if quality_preset == "中等质量 (推荐)":
+        try:
+            sizes = _optimize_pdf_with_pymupdf(input_path, output_path, quality_preset)
+        except _PYMUPDF_ERRORS as e:
+            logger.warning(f"PyMuPDF 优化失败，回退到 pikepdf: {e}")
 
-    original_size = os.path.getsize(input_path)
-    optimized_size = os.path.getsize(output_path)
+    if sizes is None:
+        sizes = _optimize_pdf_with_pikepdf(input_path, output_path, quality_preset)
+    original_size, optimized_size = sizes
 
     if progress_callback:
         progress_callback(100)
@@ -49,52 +124,59 @@ def optimize_pdf(input_path, output_path, quality_preset, progress_callback=None
         "message": "优化成功！"
     }
 
+def _build_gs_optimize_cmd(gs_executable, input_path, output_path, pdf_setting):
+    """构造 Ghostscript 优化命令"""
+    cmd = [
+        gs_executable,
+        "-sDEVICE=pdfwrite",
+        "-dCompatibilityLevel=1.4",
+        f"-dPDFSETTINGS={pdf_setting}",
+        "-dNOPAUSE",
+        "-dQUIET",
+        "-dBATCH",
+        "-dAutoRotatePages=/None",
+    ]
+    if pdf_setting == "/screen":
+        # 最大压缩模式下合并重复图片，同时减少 CPU 与输出体积
+        cmd.append("-dDetectDuplicateImages=true")
+    cmd += [f"-sOutputFile={output_path}", input_path]
+    return cmd
+
 @handle_exception
-def optimize_pdf_with_ghostscript(input_path, output_path, quality_preset):
+def optimize_pdf_with_ghostscript(input_path, output_path, quality_preset, cancel_event=None):
     """
     使用 Ghostscript 命令行优化 PDF 文件。
     :param input_path: 输入 PDF 文件路径
     :param output_path: 输出 PDF 文件路径
     :param quality_preset: 质量预设字符串，如 "低质量 (最大压缩)", "中等质量 (推荐)", "高质量 (轻度优化)"
+    :param cancel_event: 可选的 threading.Event，被设置时终止 Ghostscript 进程
     :return: dict 优化结果
     """
     gs_executable = _get_gs_executable()
     if not gs_executable:
         return {"success": False, "message": "未找到 Ghostscript 可执行文件，请安装 Ghostscript 并确保其在系统 PATH 中。"}
 
-    quality_map = {
-        "低质量 (最大压缩)": "/screen",
-        "中等质量 (推荐)": "/ebook",
-        "高质量 (轻度优化)": "/prepress"
-    }
-    pdf_setting = quality_map.get(quality_preset, "/ebook")
+    pdf_setting = _GS_PRESETS.get(quality_preset, _DEFAULT_GS_PRESET)
 
-    cmd = [
-        gs_executable,
-        "-sDEVICE=pdfwrite",
-        "-dCompatibilityLevel=1.4",
-        f"-dPDFSETTINGS={pdf_setting}",
-        "-dNOPAUSE",
-        "-dQUIET",
-        "-dBATCH",
-        f"-sOutputFile={output_path}",
-        input_path
-    ]
+    original_size = os.stat(input_path).st_size
 
-    process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True, startupinfo=get_subprocess_startup_info())
-    stdout, stderr = process.communicate()
+    cmd = _build_gs_optimize_cmd(gs_executable, input_path, output_path, pdf_setting)
+    returncode, stderr, cancelled = run_ghostscript(cmd, cancel_event)
 
-    if process.returncode != 0:
-        error_message = f"Ghostscript 优化失败，返回码：{process.returncode}，错误信息：{stderr.strip()}"
+    if cancelled:
+        remove_partial_output(output_path)
+        return {"success": False, "cancelled": True, "message": "任务已取消"}
+
+    if returncode != 0:
+        error_message = f"Ghostscript 优化失败，返回码：{returncode}，错误信息：{stderr.strip()}"
         logger.error(error_message)
         return {"success": False, "message": error_message}
 
-    original_size = os.path.getsize(input_path)
-    optimized_size = os.path.getsize(output_path)
+    optimized_size = os.stat(output_path).st_size
 
     return {
         "success": True,
         "original_size": original_size,
         "optimized_size": optimized_size,
         "message": "优化成功！"
-    }
\ No newline at end of file
+    }
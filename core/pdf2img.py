@@ -1,6 +1,61 @@
 import os
+import queue
+import threading
 import fitz  # PyMuPDF
-from .utils import handle_exception
+from .utils import handle_exception, throttle_progress
+
+# 后台写盘队列的最大长度，限制尚未落盘的图片占用的内存
+_WRITE_QUEUE_SIZE = 4
+
+def _image_writer(write_queue, errors):
+    """
+    后台写盘线程：依次消费 (输出路径, 图片字节) 并写入磁盘，收到 None 时退出。
+    写入失败时记录异常并丢弃后续数据，由渲染线程负责抛出。
+
+    :param write_queue: 待写入数据队列
+    :param errors: 用于回传异常的列表
+    """
+    while True:
+        item = write_queue.get()
+        try:
+            if item is None:
+                return
+            if errors:
+                continue
+            path, data = item
+            with open(path, "wb") as f:
+                f.write(data)
+        except Exception as e:
+            errors.append(e)
+        finally:
+            write_queue.task_done()
+
+def _open_for_rendering(input_path):
+    """
+    打开待渲染的 PDF，并预先加载交叉引用表。
+
+    :param input_path: 输入 PDF 文件路径
+    :return: fitz.Document
+    """
+    doc = fitz.open(input_path)
+    # 一次性加载交叉引用表，避免逐页加载时重复扫描
+    doc.xref_length()
+    return doc
+
+def _encode_pixmap(pix, image_format):
+    """
+    在内存中把页面图像编码为指定格式。
+    Pixmap.tobytes 支持的格式随 PyMuPDF 版本不同（旧版本不支持 JPEG），不支持时返回 None，
+    由调用方改用按扩展名判断格式的 Pixmap.save 直接写文件。
+
+    :param pix: fitz.Pixmap
+    :param image_format: 图片格式，如 png、jpg
+    :return: 图片字节，或 None
+    """
+    try:
+        return pix.tobytes(image_format)
+    except ValueError:
+        return None
 
 @handle_exception
 def convert_pdf_to_images(input_path, output_dir, image_format="png", dpi=300, progress_callback=None):
@@ -17,30 +72,51 @@ def convert_pdf_to_images(input_path, output_dir, image_format="png", dpi=300, p
     if not os.path.exists(output_dir):
         os.makedirs(output_dir)
 
-    doc = fitz.open(input_path)
-    page_count = len(doc)
-    base_name, _ = os.path.splitext(os.path.basename(input_path))
-    num_digits = len(str(page_count))
+    progress_callback = throttle_progress(progress_callback)
+    doc = _open_for_rendering(input_path)
+    # 渲染与写盘流水线化：当前页编码完成后交给后台线程写盘，主循环立即渲染下一页
+    write_queue = queue.Queue(maxsize=_WRITE_QUEUE_SIZE)
+    write_errors = []
+    writer = threading.Thread(target=_image_writer, args=(write_queue, write_errors), daemon=True)
+    writer.start()
+    try:
+        page_count = len(doc)
+        base_name, _ = os.path.splitext(os.path.basename(input_path))
+        num_digits = len(str(page_count))
+        can_encode = True
 
-    for page_num in range(page_count):
-        page = doc.load_page(page_num)
-        pix = page.get_pixmap(dpi=dpi)
-        page_str = str(page_num + 1).zfill(num_digits)
+        for page_num in range(page_count):
+            if write_errors:
+                raise write_errors[0]
+            page = doc.load_page(page_num)
+            pix = page.get_pixmap(dpi=dpi)
+            page_str = str(page_num + 1).zfill(num_digits)
 
-        if page_count > 1:
-            output_filename = f"{base_name}[DPI{dpi}][页面{page_str}].{image_format}"
-        else:
-            output_filename = f"{base_name}[DPI{dpi}].{image_format}"
-        
-        output_path = os.path.join(output_dir, output_filename)
+            if page_count > 1:
+                output_filename = f"{base_name}[DPI{dpi}][页面{page_str}].{image_format}"
+            else:
+                output_filename = f"{base_name}[DPI{dpi}].{image_format}"
+            
+            output_path = os.path.join(output_dir, output_filename)
 
-        pix.save(output_path)
-        if progress_callback:
-            progress_callback(page_num + 1, page_count)
+            data = _encode_pixmap(pix, image_format) if can_encode else None
+            if data is None:
+                # tobytes 不支持该格式：本页及后续页面都直接由 Pixmap.save 写盘
+                can_encode = False
+                pix.save(output_path)
+            else:
+                write_queue.put((output_path, data))
+            if progress_callback:
+                progress_callback(page_num + 1, page_count)
+    finally:
+        write_queue.put(None)
+        writer.join()
+        doc.close()
 
-    doc.close()
+    if write_errors:
+        raise write_errors[0]
 
     return {
         "success": True,
         "message": f"成功将 PDF 转换为 {page_count} 张图片！"
-    }
\ No newline at end of file
+    }
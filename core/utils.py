@@ -1,11 +1,15 @@
+import atexit
+import contextlib
+import errno
 import os
 import re
 import shutil
 import subprocess
 import sys
+import time
+import threading
 import logging
 import functools
-import fitz  # PyMuPDF
 
 # 日志配置已移除，使用默认logger
 logger = logging.getLogger(__name__)
@@ -25,6 +29,28 @@ def handle_exception(func):
             return {"success": False, "message": error_message}
     return wrapper
 
+def throttle_progress(progress_callback, min_interval=0.05):
+    """
+    包装 (current, total) 形式的进度回调，限制其调用频率。
+    仅当距上次调用超过 min_interval 秒，或已处理到最后一项时才转发，
+    避免逐页/逐文件触发跨线程信号导致 Qt 事件队列被淹没。
+    :param progress_callback: 原始进度回调函数，可为 None
+    :param min_interval: 两次调用之间的最小间隔（秒），默认 0.05 即 20Hz
+    :return: 节流后的回调函数；原回调为 None 时返回 None
+    """
+    if progress_callback is None:
+        return None
+
+    last_emit = 0.0
+
+    def wrapper(current, total):
+        nonlocal last_emit
+        now = time.monotonic()
+        if current >= total or now - last_emit >= min_interval:
+            last_emit = now
+            progress_callback(current, total)
+    return wrapper
+
 def get_subprocess_startup_info():
     """
     为 subprocess.Popen 创建启动信息，以便在 Windows 上隐藏控制台窗口。
@@ -37,17 +63,90 @@ def get_subprocess_startup_info():
         startupinfo.wShowWindow = subprocess.SW_HIDE
     return startupinfo
 
-# 缓存Ghostscript可执行文件路径
+def communicate_cancellable(process, cancel_event=None, poll_interval=0.2):
+    """
+    等待子进程结束并读取其输出，等待期间定期检查 cancel_event。
+    cancel_event 被设置时立即结束子进程，而不是等它处理完当前文件。
+    :param process: subprocess.Popen 对象
+    :param cancel_event: threading.Event，为 None 时等同于 process.communicate()
+    :param poll_interval: 检查取消标志的间隔（秒）
+    :return: (stdout, stderr, cancelled)
+    """
+    if cancel_event is None:
+        stdout, stderr = process.communicate()
+        return stdout, stderr, False
+    while True:
+        try:
+            stdout, stderr = process.communicate(timeout=poll_interval)
+            return stdout, stderr, False
+        except subprocess.TimeoutExpired:
+            if cancel_event.is_set():
+                process.kill()
+                stdout, stderr = process.communicate()
+                return stdout, stderr, True
+
+def remove_partial_output(path):
+    """删除被中途取消的任务留下的不完整输出文件"""
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+def report_process_pid(pid_queue):
+    """进程池子进程的初始化函数：把自身 PID 放入队列，主进程停止任务时据此终止正在运行的子进程"""
+    pid_queue.put(os.getpid())
+
+def run_ghostscript(cmd, cancel_event=None, poll_interval=0.2):
+    """
+    运行 Ghostscript 命令直到结束，运行期间检查 cancel_event。
+    :param cmd: 完整的 Ghostscript 命令参数列表
+    :param cancel_event: 可选的 threading.Event，被设置时终止进程
+    :param poll_interval: 检查取消标志的间隔（秒）
+    :return: (returncode, stderr, cancelled)
+    """
+    process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True, startupinfo=get_subprocess_startup_info())
+    _, stderr, cancelled = communicate_cancellable(process, cancel_event, poll_interval)
+    return process.returncode, stderr, cancelled
+
+# Windows 下以 CREATE_NO_WINDOW 启动子进程即可隐藏控制台窗口，无需额外构造 STARTUPINFO
+_NO_WINDOW_CREATIONFLAGS = subprocess.CREATE_NO_WINDOW if sys.platform == "win32" else 0
+
+# 缓存Ghostscript可执行文件路径，空字符串表示已查找但未找到
 _GS_EXECUTABLE_PATH = None
 
+def _find_executable_in_path(names):
+    """
+    在系统 PATH 中查找第一个存在的可执行文件。
+    与依次调用多次 shutil.which 不同，PATH（及 Windows 下的 PATHEXT）只遍历一遍，
+    每个目录内按 names 的顺序检查各候选名称。
+
+    :param names: 候选可执行文件名（不含扩展名）
+    :return: 找到的完整路径，未找到时返回 None
+    """
+    if sys.platform == "win32":
+        exts = [ext for ext in os.environ.get("PATHEXT", ".EXE").split(os.pathsep) if ext]
+    else:
+        exts = [""]
+
+    for directory in os.environ.get("PATH", "").split(os.pathsep):
+        if not directory:
+            continue
+        for name in names:
+            for ext in exts:
+                candidate = os.path.join(directory, name + ext)
+                if os.path.isfile(candidate) and os.access(candidate, os.X_OK):
+                    return candidate
+    return None
+
 def _get_gs_executable():
     """
     查找 Ghostscript 可执行文件。
     优先级: 环境变量 -> 打包路径 -> 系统 PATH。
+    查找结果（包括未找到）会被缓存，未安装时不会反复遍历 PATH。
     """
     global _GS_EXECUTABLE_PATH
-    if _GS_EXECUTABLE_PATH:
-        return _GS_EXECUTABLE_PATH
+    if _GS_EXECUTABLE_PATH is not None:
+        return _GS_EXECUTABLE_PATH or None
 
     # 1. 从环境变量中查找
     gs_exe = os.environ.get("GHOSTSCRIPT_EXECUTABLE")
@@ -64,17 +163,59 @@ def _get_gs_executable():
             return bundled_gs
 
     # 3. 在系统 PATH 中查找
-    found_gs = shutil.which("gs") or shutil.which("gswin64c") or shutil.which("gswin32c")
-    if found_gs:
-        _GS_EXECUTABLE_PATH = found_gs
+    found_gs = _find_executable_in_path(("gs", "gswin64c", "gswin32c"))
+    _GS_EXECUTABLE_PATH = found_gs or ""
     return found_gs
 
 def is_ghostscript_installed():
     return _get_gs_executable() is not None
 
+# 进程内共享的 HTTP 客户端，复用连接池以省去重复的 TCP/TLS 握手
+_HTTP_CLIENT = None
+_HTTP_CLIENT_LOCK = threading.Lock()
+
+def get_http_client():
+    """
+    获取进程内共享的 httpx.Client。
+    首次调用时创建，之后各线程复用同一连接池；进程退出时自动关闭。
+    """
+    global _HTTP_CLIENT
+    if _HTTP_CLIENT is None:
+        with _HTTP_CLIENT_LOCK:
+            if _HTTP_CLIENT is None:
+                import httpx
+                _HTTP_CLIENT = httpx.Client(
+                    timeout=10.0,
+                    limits=httpx.Limits(max_keepalive_connections=8, max_connections=16)
+                )
+                atexit.register(_HTTP_CLIENT.close)
+    return _HTTP_CLIENT
+
+# 缓存pandoc可执行文件路径，空字符串表示已查找但未找到
+_PANDOC_PATH = None
+
+def _get_pandoc_executable():
+    """
+    查找 pandoc 可执行文件。
+    查找结果（包括未找到）会被缓存，避免每次转换都重新遍历 PATH。
+    """
+    global _PANDOC_PATH
+    if _PANDOC_PATH is None:
+        _PANDOC_PATH = shutil.which("pandoc") or ""
+    return _PANDOC_PATH or None
+
 def is_pandoc_installed():
     """检查系统中是否安装了 pandoc"""
-    return shutil.which("pandoc") is not None
+    return _get_pandoc_executable() is not None
+
+# 匹配被错误地包裹在```...```代码块中的$$...$$公式
+# 它会捕获语言标识符（如latex, tex）以及公式本身
+# re.DOTALL 使得 . 可以匹配换行符
+_FORMULA_PATTERN = re.compile(r"```[a-zA-Z]*\s*(\${2}.*?\${2})\s*```", re.DOTALL)
+
+def _unwrap_formula(match):
+    """提取并返回捕获的公式内容，移除公式前后多余的空白字符"""
+    return match.group(1).strip()
 
 def preprocess_markdown_for_pandoc(markdown_content: str) -> str:
     """
@@ -85,74 +226,117 @@ def preprocess_markdown_for_pandoc(markdown_content: str) -> str:
     :param markdown_content: 原始的Markdown字符串。
     :return: 处理后的Markdown字符串，仅包含公式修正。
     """
-    # 正则表达式，用于匹配被错误地包裹在```...```代码块中的$$...$$公式
-    # 它会捕获语言标识符（如latex, tex）以及公式本身
-    # re.DOTALL 使得 . 可以匹配换行符
-    formula_pattern = re.compile(r"```[a-zA-Z]*\s*(\${2}.*?\${2})\s*```", re.DOTALL)
-    
-    # 使用一个函数来替换找到的匹配项
-    def replacer(match):
-        # 提取并返回捕获的公式内容（第一个捕获组）
-        # .strip() 用于移除可能存在于公式前后的多余空白字符
-        return match.group(1).strip()
-        
-    # 执行替换并返回结果
-    return formula_pattern.sub(replacer, markdown_content)
+    # 绝大多数内容不含代码块包裹的公式，先用子串查找快速跳过整段正则扫描
+    if "```" not in markdown_content or "$$" not in markdown_content:
+        return markdown_content
+    return _FORMULA_PATTERN.sub(_unwrap_formula, markdown_content)
+
+
+# 向子进程管道写入数据时每次系统调用的最大字节数
+_PIPE_WRITE_CHUNK_SIZE = 1 << 20
 
+def _drain_stream(stream, buffer):
+    """在后台线程中读取子进程输出流直到 EOF，防止管道缓冲区写满导致死锁"""
+    buffer.extend(stream.read())
+    stream.close()
 
 @handle_exception
 def convert_markdown_to_docx_with_pandoc(markdown_content, docx_path):
     """
     使用 pandoc 将 Markdown 字符串转换为 DOCX 文件。
-    对于大文件，此方法通过写入临时文件来避免管道缓冲区问题。
+    内容通过 stdin 管道直接传给 pandoc，stderr 由后台线程读取，
+    因此大文件也不会因管道缓冲区写满而死锁，且无需落盘临时文件。
     :param markdown_content: Markdown 格式的字符串内容。
     :param docx_path: 输出的 DOCX 文件路径。
     :return: 包含 success 标志和消息的字典。
     """
-    if not is_pandoc_installed():
+    pandoc_executable = _get_pandoc_executable()
+    if not pandoc_executable:
         return {"success": False, "message": "未找到 Pandoc，请确保已正确安装并添加到系统PATH。"}
 
-    temp_md_path = None
+    cmd = [
+        pandoc_executable,
+        "-f", "markdown+tex_math_dollars+hard_line_breaks",
+        "-t", "docx",
+        "-o", docx_path
+    ]
+
+    process = subprocess.Popen(
+        cmd,
+        stdin=subprocess.PIPE,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        creationflags=_NO_WINDOW_CREATIONFLAGS
+    )
+
+    stderr = bytearray()
+    stderr_thread = threading.Thread(target=_drain_stream, args=(process.stderr, stderr), daemon=True)
+    stderr_thread.start()
+
     try:
-        # 1. 创建一个临时 Markdown 文件
-        # 在 docx 文件旁边创建临时文件，以确保权限一致
-        base_name, _ = os.path.splitext(docx_path)
-        temp_md_path = base_name + "_temp.md"
-        with open(temp_md_path, 'w', encoding='utf-8') as f:
-            f.write(markdown_content)
-
-        # 2. 调用 pandoc 读取临时文件进行转换
-        cmd = [
-            "pandoc",
-            "-f", "markdown+tex_math_dollars+hard_line_breaks",
-            "-t", "docx",
-            "-o", docx_path,
-            temp_md_path  # 从文件读取
-        ]
-
-        process = subprocess.Popen(
-            cmd,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            startupinfo=get_subprocess_startup_info()
-        )
-
-        _, stderr = process.communicate()
-
-        if process.returncode != 0:
-            error_message = f"Pandoc 转换失败: {stderr.decode('utf-8', 'ignore')}"
-            logger.error(error_message)
-            return {"success": False, "message": error_message}
+        try:
+            # 直接对管道描述符分块写入编码后的内容，绕过文件对象的缓冲层，
+            # memoryview 切片不复制数据
+            data = memoryview(markdown_content.encode("utf-8"))
+            stdin_fd = process.stdin.fileno()
+            offset = 0
+            while offset < len(data):
+                offset += os.write(stdin_fd, data[offset:offset + _PIPE_WRITE_CHUNK_SIZE])
+        except OSError as e:
+            # pandoc 提前退出：POSIX 上为 BrokenPipeError，Windows 上向已关闭的管道写入报 EINVAL；
+            # 错误原因以返回码和 stderr 为准
+            if not isinstance(e, BrokenPipeError) and e.errno != errno.EINVAL:
+                raise
+        finally:
+            with contextlib.suppress(OSError):
+                process.stdin.close()
+    finally:
+        process.wait()
+        stderr_thread.join()
+
+    if process.returncode != 0:
+        error_message = f"Pandoc 转换失败: {stderr.decode('utf-8', 'ignore')}"
+        logger.error(error_message)
+        return {"success": False, "message": error_message}
+
+    return {"success": True, "message": f"成功转换为: {docx_path}"}
+
 
-        return {"success": True, "message": f"成功转换为: {docx_path}"}
+# 图片转 PDF 的保存选项，单张与批量转换共用，同一图片两条路径的输出一致：
+# 新文档中没有需要清理的孤立对象（garbage=0），只压缩页面内容流
+_IMAGE_PDF_SAVE_OPTIONS = {"garbage": 0, "deflate": True}
 
+# 按扩展名以内存流打开时可作为 filetype 传给 fitz.open 的图片格式
+_STREAM_IMAGE_TYPES = frozenset({"jpg", "jpeg", "png", "bmp", "tif", "tiff", "gif"})
+
+def _append_image_page(pdf_document, image_path):
+    """
+    将一张图片作为新页面追加到PDF文档中，页面尺寸与图片相同
+
+    :param pdf_document: 目标 fitz 文档
+    :param image_path: 图片文件路径
+    """
+    import fitz  # PyMuPDF
+
+    # 只读取一次图片数据，尺寸检测与插入共用同一份字节，避免重复读盘和解码
+    with open(image_path, "rb") as f:
+        image_data = f.read()
+
+    # 扩展名是已知图片格式时以内存流打开图片获取页面尺寸：只解析图片头，不解码像素，也不再按路径重新打开文件；
+    # 没有扩展名或扩展名未知时按路径打开，由 MuPDF 根据文件内容识别格式
+    image_type = os.path.splitext(image_path)[1].lstrip(".").lower()
+    if image_type in _STREAM_IMAGE_TYPES:
+        img_document = fitz.open(stream=image_data, filetype=image_type)
+    else:
+        img_document = fitz.open(image_path)
+    try:
+        img_rect = img_document[0].rect
     finally:
-        # 确保临时文件在操作结束后被删除
-        if temp_md_path and os.path.exists(temp_md_path):
-            try:
-                os.remove(temp_md_path)
-            except OSError as e:
-                logger.error(f"删除临时文件 {temp_md_path} 失败: {e}")
+        img_document.close()
+
+    # 将图片插入到新页面中（JPEG 等格式会被原样嵌入，不重新编码）
+    pdf_page = pdf_document.new_page(width=img_rect.width, height=img_rect.height)
+    pdf_page.insert_image(img_rect, stream=image_data, keep_proportion=False)
 
 
 @handle_exception
@@ -164,32 +348,45 @@ def convert_image_to_pdf(image_path, output_pdf_path):
     :param output_pdf_path: 输出PDF文件路径
     :return: 包含 success 标志和消息的字典
     """
-    # 创建一个新的PDF文档
-    pdf_document = fitz.open()
+    import fitz  # PyMuPDF
 
-    # 打开图片文件
-    img_document = fitz.open(image_path)
+    pdf_document = fitz.open()
+    try:
+        _append_image_page(pdf_document, image_path)
+        pdf_document.save(output_pdf_path, **_IMAGE_PDF_SAVE_OPTIONS)
+    finally:
+        pdf_document.close()
 
-    # 获取图片页面
-    page = img_document[0]
+    return {
+        "success": True,
+        "message": f"图片已成功转换为PDF: {output_pdf_path}"
+    }
 
-    # 获取图片的尺寸
-    img_rect = page.rect
 
-    # 在PDF中创建一个新页面，尺寸与图片相同
-    pdf_page = pdf_document.new_page(width=img_rect.width, height=img_rect.height)
+@handle_exception
+def convert_images_to_pdf(image_paths, output_pdf_path):
+    """
+    将多张图片按顺序合并转换为一个PDF文件，每张图片占一页。
+    所有图片共用同一个文档对象，只保存一次，避免逐个转换时的重复开销。
 
-    # 将图片插入到PDF页面中
-    pdf_page.insert_image(img_rect, filename=image_path)
+    :param image_paths: 图片文件路径列表
+    :param output_pdf_path: 输出PDF文件路径
+    :return: 包含 success 标志和消息的字典
+    """
+    if not image_paths:
+        return {"success": False, "message": "没有需要转换的图片。"}
 
-    # 保存PDF文件
-    pdf_document.save(output_pdf_path)
+    import fitz  # PyMuPDF
 
-    # 关闭文档
-    pdf_document.close()
-    img_document.close()
+    pdf_document = fitz.open()
+    try:
+        for image_path in image_paths:
+            _append_image_page(pdf_document, image_path)
+        pdf_document.save(output_pdf_path, **_IMAGE_PDF_SAVE_OPTIONS)
+    finally:
+        pdf_document.close()
 
     return {
         "success": True,
-        "message": f"图片已成功转换为PDF: {output_pdf_path}"
-    }
\ No newline at end of file
+        "message": f"{len(image_paths)} 张图片已成功转换为PDF: {output_pdf_path}"
+    }
@@ -1,8 +1,11 @@
 import sys
+import multiprocessing
 from PySide6.QtWidgets import QApplication
 from ui.main_window import MainWindow
 
 if __name__ == "__main__":
+    # 打包后的程序中，进程池的子进程需由此进入而不是再次启动界面
+    multiprocessing.freeze_support()
     app = QApplication(sys.argv)
     window = MainWindow()
     window.show()
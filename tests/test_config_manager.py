@@ -0,0 +1,85 @@
+import os
+
+import pytest
+
+from core import config_manager
+from core.config_manager import ConfigManager
+from core.config_models import APIConfig, ConfigProfile
+
+
+def _profile(name="测试配置"):
+    profile = ConfigProfile()
+    profile.add_config(
+        APIConfig(name=name, provider="OpenAI-Compatible", api_key="k", extra_params={"headers": {"a": "1"}})
+    )
+    return profile
+
+
+def test_write_json_file_round_trip(tmp_path):
+    path = tmp_path / "data.json"
+    data = {"名称": "值", "items": [1, 2, 3]}
+
+    config_manager._write_json_file(path, data)
+
+    assert config_manager._read_json_file(path) == data
+    assert not os.path.exists(f"{path}.tmp")
+
+
+def test_write_json_file_failure_keeps_original(tmp_path, monkeypatch):
+    path = tmp_path / "data.json"
+    config_manager._write_json_file(path, {"old": True})
+
+    def failing_replace(src, dst):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(config_manager.os, "replace", failing_replace)
+    with pytest.raises(OSError):
+        config_manager._write_json_file(path, {"new": True})
+
+    assert config_manager._read_json_file(path) == {"old": True}
+    assert not os.path.exists(f"{path}.tmp")
+
+
+def test_load_configs_reuses_parsed_file_until_it_changes(tmp_path, monkeypatch):
+    manager = ConfigManager(str(tmp_path))
+    assert manager.save_configs(_profile(), create_backup=False)
+    reads = []
+    real_read = config_manager._read_json_file
+
+    def counting_read(path):
+        reads.append(path)
+        return real_read(path)
+
+    monkeypatch.setattr(config_manager, "_read_json_file", counting_read)
+
+    first = manager.load_configs()
+    second = manager.load_configs()
+
+    assert reads == []
+    assert [c.name for c in first.configs] == ["测试配置"]
+    assert first is not second
+
+    # 其他进程改写了配置文件：修改时间或大小变化后重新解析
+    other = ConfigManager(str(tmp_path))
+    assert other.save_configs(_profile("外部修改后的配置"), create_backup=False)
+    st = os.stat(manager.config_file)
+    os.utime(manager.config_file, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+
+    assert [c.name for c in manager.load_configs().configs] == ["外部修改后的配置"]
+    assert len(reads) == 1
+
+
+def test_mutating_loaded_or_saved_profile_does_not_change_cache(tmp_path):
+    manager = ConfigManager(str(tmp_path))
+    saved = _profile()
+    assert manager.save_configs(saved, create_backup=False)
+    saved.configs[0].extra_params["headers"]["a"] = "saved"
+
+    loaded = manager.load_configs()
+    assert loaded.configs[0].extra_params == {"headers": {"a": "1"}}
+    loaded.configs[0].extra_params["headers"]["a"] = "loaded"
+    loaded.configs.clear()
+
+    again = manager.load_configs()
+    assert [c.name for c in again.configs] == ["测试配置"]
+    assert again.configs[0].extra_params == {"headers": {"a": "1"}}
@@ -0,0 +1,77 @@
+import os
+import threading
+import time
+
+import pytest
+
+from ui import main_window
+
+
+def _report_pid(seconds, output_path):
+    """在进程池子进程中运行：等待指定秒数后返回子进程的 PID"""
+    time.sleep(seconds)
+    return os.getpid()
+
+
+def _run_in_processes(jobs, on_started=None):
+    worker = main_window.BaseWorker()
+    results = {}
+    worker.file_finished.connect(lambda index, result: results.__setitem__(index, result))
+    worker._run_files_in_processes(
+        jobs, _report_pid, lambda pid: {"success": True, "pid": pid}
+    )
+    return results
+
+
+@pytest.fixture
+def fresh_pool():
+    yield
+    pool = main_window._process_pool
+    if pool is not None:
+        main_window._terminate_process_pool(pool)
+
+
+def test_process_pool_rebuilt_after_child_killed_mid_run(tmp_path, fresh_pool):
+    """有子进程被外部结束时，未完成的文件报告失败，进程池被丢弃并在下次使用时重建"""
+    first = _run_in_processes([(0, str(tmp_path / "a.pdf")), (0, str(tmp_path / "b.pdf"))])
+    assert all(result["success"] for result in first.values())
+    victim = first[0]["pid"]
+    broken_pool = main_window._process_pool
+
+    killer = threading.Timer(1.0, os.kill, (victim, 9))
+    killer.start()
+    outputs = [tmp_path / f"{i}.pdf" for i in range(2)]
+    results = _run_in_processes([(30, str(path)) for path in outputs])
+    killer.join()
+
+    assert sorted(results) == [0, 1]
+    assert not any(result["success"] for result in results.values())
+    assert main_window._process_pool is not broken_pool
+
+    again = _run_in_processes([(0, str(tmp_path / "c.pdf")), (0, str(tmp_path / "d.pdf"))])
+    assert all(result["success"] for result in again.values())
+
+
+def test_process_pool_broken_between_runs_is_replaced(tmp_path, fresh_pool):
+    """进程池在两次任务之间损坏时，提交前丢弃并改用新建的进程池"""
+    first = _run_in_processes([(0, str(tmp_path / "a.pdf")), (0, str(tmp_path / "b.pdf"))])
+    broken_pool = main_window._process_pool
+    os.kill(first[0]["pid"], 9)
+    time.sleep(1)
+
+    results = _run_in_processes([(0, str(tmp_path / "c.pdf")), (0, str(tmp_path / "d.pdf"))])
+
+    assert all(result["success"] for result in results.values())
+    assert main_window._process_pool is not broken_pool
+
+
+@pytest.mark.parametrize(
+    ("file_path", "tag", "expected"),
+    [
+        ("report.pdf", "_optimized", "report_optimized.pdf"),
+        (os.path.join("目录", "文件.v2.pdf"), "[转曲]", os.path.join("目录", "文件.v2[转曲].pdf")),
+        (os.path.join("dir", "noext"), "_x", os.path.join("dir", "noext_x")),
+    ],
+)
+def test_tagged_output_path(file_path, tag, expected):
+    assert main_window._tagged_output_path(file_path, tag) == expected
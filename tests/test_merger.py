@@ -0,0 +1,156 @@
+import os
+
+import fitz
+import pytest
+
+from core import merger
+
+
+def _make_pdf(path, label, pages=2):
+    doc = fitz.open()
+    for i in range(pages):
+        doc.new_page().insert_text((72, 72), f"{label}-{i}")
+    doc.save(str(path))
+    doc.close()
+
+
+def _page_texts(path):
+    with fitz.open(str(path)) as doc:
+        return [page.get_text().strip() for page in doc]
+
+
+def test_merge_keeps_order_and_duplicates(tmp_path):
+    a, b = tmp_path / "a.pdf", tmp_path / "b.pdf"
+    _make_pdf(a, "a")
+    _make_pdf(b, "b")
+    output = tmp_path / "merged.pdf"
+
+    result = merger.merge_pdfs([str(a), str(b), str(a)], str(output))
+
+    assert result["success"], result
+    assert result["merged_files_count"] == 3
+    assert _page_texts(output) == ["a-0", "a-1", "b-0", "b-1", "a-0", "a-1"]
+
+
+@pytest.mark.skipif(not os.path.isdir("/proc/self/fd"), reason="需要 /proc 统计打开的文件描述符")
+def test_merge_bounds_open_sources(tmp_path):
+    paths = []
+    for i in range(6 * merger._MERGE_OPEN_AHEAD):
+        path = tmp_path / f"in{i}.pdf"
+        _make_pdf(path, f"f{i}", pages=1)
+        paths.append(str(path))
+    output = tmp_path / "merged.pdf"
+    baseline = len(os.listdir("/proc/self/fd"))
+    peak = baseline
+
+    def on_progress(_):
+        nonlocal peak
+        peak = max(peak, len(os.listdir("/proc/self/fd")))
+
+    result = merger.merge_pdfs(paths, str(output), on_progress)
+
+    assert result["success"], result
+    assert peak - baseline <= merger._MERGE_OPEN_AHEAD + 2
+    assert len(os.listdir("/proc/self/fd")) == baseline
+    assert _page_texts(output) == [f"f{i}-0" for i in range(len(paths))]
+
+
+def test_merge_missing_input_reports_failure(tmp_path):
+    a = tmp_path / "a.pdf"
+    _make_pdf(a, "a")
+
+    result = merger.merge_pdfs([str(a), str(tmp_path / "missing.pdf")], str(tmp_path / "out.pdf"))
+
+    assert result["success"] is False
+
+
+def test_write_gs_argument_file_quotes_each_path(tmp_path):
+    paths = [str(tmp_path / "a b.pdf"), str(tmp_path / "中文.pdf")]
+
+    arg_file = merger._write_gs_argument_file(paths)
+    try:
+        with open(arg_file, encoding="utf-8") as f:
+            assert f.read() == "".join(f'"{path}"\n' for path in paths)
+    finally:
+        os.remove(arg_file)
+
+
+@pytest.mark.skipif(os.name == "nt", reason="Windows 路径会先统一为正斜杠")
+def test_gs_input_args_pass_special_paths_directly():
+    paths = ["/d/1.pdf", "/d/2.pdf", '/d/quo"te.pdf', "/d/back\\slash.pdf", "/d/3.pdf"]
+
+    args, arg_files = merger._build_gs_input_args(paths)
+    try:
+        assert len(arg_files) == 2
+        assert args == [f"@{arg_files[0]}", '/d/quo"te.pdf', "/d/back\\slash.pdf", f"@{arg_files[1]}"]
+        with open(arg_files[0], encoding="utf-8") as f:
+            assert f.read() == '"/d/1.pdf"\n"/d/2.pdf"\n'
+        with open(arg_files[1], encoding="utf-8") as f:
+            assert f.read() == '"/d/3.pdf"\n'
+    finally:
+        for arg_file in arg_files:
+            os.remove(arg_file)
+
+
+def test_gs_merge_uses_argument_files_for_long_command(tmp_path, monkeypatch):
+    paths = [str(tmp_path / f"{'x' * 200}_{i}.pdf") for i in range(200)]
+    seen = {}
+
+    def fake_run_ghostscript(cmd, cancel_event=None):
+        seen["cmd"] = cmd
+        seen["arg_files"] = [arg[1:] for arg in cmd if arg.startswith("@")]
+        seen["existed"] = all(os.path.exists(f) for f in seen["arg_files"])
+        return 0, "", False
+
+    monkeypatch.setattr(merger, "_get_gs_executable", lambda: "gs")
+    monkeypatch.setattr(merger, "run_ghostscript", fake_run_ghostscript)
+
+    result = merger.merge_pdfs_with_ghostscript(paths, str(tmp_path / "out.pdf"))
+
+    assert result["success"], result
+    assert len(seen["arg_files"]) == 1
+    assert seen["existed"]
+    assert not any(path in seen["cmd"] for path in paths)
+    assert not any(os.path.exists(f) for f in seen["arg_files"])
+
+
+def test_gs_merge_short_command_passes_paths_directly(tmp_path, monkeypatch):
+    paths = [str(tmp_path / "a.pdf"), str(tmp_path / "b.pdf")]
+    seen = {}
+
+    def fake_run_ghostscript(cmd, cancel_event=None):
+        seen["cmd"] = cmd
+        return 0, "", False
+
+    monkeypatch.setattr(merger, "_get_gs_executable", lambda: "gs")
+    monkeypatch.setattr(merger, "run_ghostscript", fake_run_ghostscript)
+
+    result = merger.merge_pdfs_with_ghostscript(paths, str(tmp_path / "out.pdf"))
+
+    assert result["success"], result
+    assert seen["cmd"][-2:] == paths
+
+
+def test_merge_opens_duplicate_inputs_once(tmp_path, monkeypatch):
+    a, b = tmp_path / "a.pdf", tmp_path / "b.pdf"
+    _make_pdf(a, "a")
+    _make_pdf(b, "b")
+    output = tmp_path / "merged.pdf"
+    opened = []
+    real_open = merger.pikepdf.open
+
+    def counting_open(path, *args, **kwargs):
+        opened.append(os.path.basename(path))
+        return real_open(path, *args, **kwargs)
+
+    monkeypatch.setattr(merger.pikepdf, "open", counting_open)
+
+    same_a = str(tmp_path / "." / "a.pdf")
+    result = merger.merge_pdfs([str(a), str(b), same_a, str(a)], str(output))
+
+    assert result["success"], result
+    assert sorted(opened) == ["a.pdf", "b.pdf"]
+    assert _page_texts(output) == ["a-0", "a-1", "b-0", "b-1"] + ["a-0", "a-1"] * 2
+    with merger.pikepdf.open(output) as pdf:
+        page_objects = [page.obj.objgen for page in pdf.pages]
+    assert len(set(page_objects)) == len(page_objects)
@@ -0,0 +1,58 @@
+import os
+
+import fitz
+import pikepdf
+import pytest
+
+from core import optimizer
+
+
+def _make_pdf(path, pages=3):
+    doc = fitz.open()
+    for i in range(pages):
+        doc.new_page().insert_text((72, 72), f"page {i + 1}")
+    doc.save(str(path))
+    doc.close()
+
+
+@pytest.mark.parametrize("quality_preset", list(optimizer._PIKEPDF_PRESETS))
+def test_optimize_linearizes_as_preset_says(tmp_path, quality_preset):
+    source = tmp_path / "in.pdf"
+    _make_pdf(source)
+    output = tmp_path / "out.pdf"
+
+    result = optimizer.optimize_pdf(str(source), str(output), quality_preset)
+
+    assert result["success"], result
+    with pikepdf.open(output) as pdf:
+        assert pdf.is_linearized == optimizer._PIKEPDF_PRESETS[quality_preset][2]
+        assert len(pdf.pages) == 3
+    assert set(os.listdir(tmp_path)) == {"in.pdf", "out.pdf"}
+
+
+def test_pymupdf_failure_falls_back_to_pikepdf(tmp_path, monkeypatch):
+    source = tmp_path / "in.pdf"
+    _make_pdf(source)
+    output = tmp_path / "out.pdf"
+
+    def failing_open(*args, **kwargs):
+        raise RuntimeError("cannot open")
+
+    monkeypatch.setattr(optimizer.fitz, "open", failing_open)
+
+    result = optimizer.optimize_pdf(str(source), str(output), "中等质量 (推荐)")
+
+    assert result["success"], result
+    with pikepdf.open(output) as pdf:
+        assert pdf.is_linearized
+
+
+def test_optimize_reports_actual_file_sizes(tmp_path):
+    source = tmp_path / "in.pdf"
+    _make_pdf(source)
+    output = tmp_path / "out.pdf"
+
+    result = optimizer.optimize_pdf(str(source), str(output), "高质量 (轻度优化)")
+
+    assert result["original_size"] == os.path.getsize(source)
+    assert result["optimized_size"] == os.path.getsize(output)
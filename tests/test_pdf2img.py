@@ -0,0 +1,68 @@
+import fitz
+import pytest
+
+from core.pdf2img import convert_pdf_to_images
+
+# 与界面中图片格式下拉框提供的选项保持一致（currentText().lower()）
+_UI_IMAGE_FORMATS = ["jpg", "png"]
+
+_MAGIC = {
+    "jpg": b"\xff\xd8\xff",
+    "png": b"\x89PNG\r\n\x1a\n",
+}
+
+
+def _make_pdf(path, pages):
+    doc = fitz.open()
+    for i in range(pages):
+        doc.new_page().insert_text((72, 72), f"page {i + 1}")
+    doc.save(str(path))
+    doc.close()
+
+
+@pytest.mark.parametrize("image_format", _UI_IMAGE_FORMATS)
+def test_convert_writes_every_page_in_format(tmp_path, image_format):
+    pdf_path = tmp_path / "sample.pdf"
+    _make_pdf(pdf_path, 3)
+    out_dir = tmp_path / "out"
+
+    result = convert_pdf_to_images(str(pdf_path), str(out_dir), image_format=image_format, dpi=36)
+
+    assert result["success"], result
+    images = sorted(out_dir.iterdir())
+    assert [p.name for p in images] == [
+        f"sample[DPI36][页面{n}].{image_format}" for n in (1, 2, 3)
+    ]
+    for image in images:
+        assert image.read_bytes().startswith(_MAGIC[image_format])
+
+
+@pytest.mark.parametrize("image_format", _UI_IMAGE_FORMATS)
+def test_convert_falls_back_to_pixmap_save(tmp_path, monkeypatch, image_format):
+    """tobytes 不支持目标格式时改由 Pixmap.save 写文件"""
+    def unsupported(self, *args, **kwargs):
+        raise ValueError("unsupported format")
+
+    monkeypatch.setattr(fitz.Pixmap, "tobytes", unsupported)
+    pdf_path = tmp_path / "sample.pdf"
+    _make_pdf(pdf_path, 2)
+    out_dir = tmp_path / "out"
+
+    result = convert_pdf_to_images(str(pdf_path), str(out_dir), image_format=image_format, dpi=36)
+
+    assert result["success"], result
+    images = sorted(out_dir.iterdir())
+    assert len(images) == 2
+    for image in images:
+        assert image.read_bytes().startswith(_MAGIC[image_format])
+
+
+def test_single_page_has_no_page_suffix(tmp_path):
+    pdf_path = tmp_path / "one.pdf"
+    _make_pdf(pdf_path, 1)
+    out_dir = tmp_path / "out"
+
+    result = convert_pdf_to_images(str(pdf_path), str(out_dir), image_format="png", dpi=36)
+
+    assert result["success"], result
+    assert [p.name for p in out_dir.iterdir()] == ["one[DPI36].png"]
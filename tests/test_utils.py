@@ -0,0 +1,135 @@
+import errno
+import stat
+import sys
+
+import pytest
+
+from core import utils
+
+
+def _fake_pandoc(tmp_path, body):
+    """生成一个代替 pandoc 的可执行脚本"""
+    script = tmp_path / "pandoc"
+    script.write_text(f"#!{sys.executable}\nimport sys\n{body}\n", encoding="utf-8")
+    script.chmod(script.stat().st_mode | stat.S_IEXEC)
+    return str(script)
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="需要可执行的 shebang 脚本")
+def test_pandoc_early_exit_reports_stderr(tmp_path, monkeypatch):
+    """pandoc 未读完输入就退出时返回其 stderr，而不是抛出管道异常"""
+    fake = _fake_pandoc(tmp_path, "sys.stderr.write('bad input'); sys.exit(3)")
+    monkeypatch.setattr(utils, "_get_pandoc_executable", lambda: fake)
+
+    result = utils.convert_markdown_to_docx_with_pandoc("x" * (8 << 20), str(tmp_path / "out.docx"))
+
+    assert result["success"] is False
+    assert "bad input" in result["message"]
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="需要可执行的 shebang 脚本")
+def test_pandoc_einval_on_write_is_handled(tmp_path, monkeypatch):
+    """Windows 上向已退出的 pandoc 写入报 EINVAL，同样以 stderr 作为错误信息"""
+    fake = _fake_pandoc(tmp_path, "sys.stdin.read(); sys.stderr.write('pandoc failed'); sys.exit(1)")
+    monkeypatch.setattr(utils, "_get_pandoc_executable", lambda: fake)
+
+    def failing_write(fd, data):
+        raise OSError(errno.EINVAL, "Invalid argument")
+
+    monkeypatch.setattr(utils.os, "write", failing_write)
+
+    result = utils.convert_markdown_to_docx_with_pandoc("# title", str(tmp_path / "out.docx"))
+
+    assert result["success"] is False
+    assert "pandoc failed" in result["message"]
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="需要可执行的 shebang 脚本")
+def test_pandoc_success_receives_full_input(tmp_path, monkeypatch):
+    received = tmp_path / "received.md"
+    fake = _fake_pandoc(
+        tmp_path,
+        f"open({str(received)!r}, 'wb').write(sys.stdin.buffer.read())",
+    )
+    monkeypatch.setattr(utils, "_get_pandoc_executable", lambda: fake)
+    content = "# 标题\n" + "正文 " * 500000
+
+    result = utils.convert_markdown_to_docx_with_pandoc(content, str(tmp_path / "out.docx"))
+
+    assert result["success"] is True
+    assert received.read_bytes() == content.encode("utf-8")
+
+
+def test_throttle_progress_limits_rate_but_keeps_last(monkeypatch):
+    clock = [100.0]
+    monkeypatch.setattr(utils.time, "monotonic", lambda: clock[0])
+    calls = []
+    throttled = utils.throttle_progress(lambda current, total: calls.append(current), min_interval=0.05)
+
+    throttled(1, 5)
+    clock[0] += 0.01
+    throttled(2, 5)
+    clock[0] += 0.05
+    throttled(3, 5)
+    throttled(4, 5)
+    throttled(5, 5)
+
+    assert calls == [1, 3, 5]
+
+
+def test_throttle_progress_none_callback():
+    assert utils.throttle_progress(None) is None
+
+
+def test_preprocess_markdown_unwraps_fenced_formula():
+    content = "前文\n```latex\n  $$\\frac{a}{b}$$  \n```\n后文 ```py\nprint(1)\n```"
+
+    result = utils.preprocess_markdown_for_pandoc(content)
+
+    assert result == "前文\n$$\\frac{a}{b}$$\n后文 ```py\nprint(1)\n```"
+
+
+@pytest.mark.parametrize("content", ["纯文本 $$x$$", "```\ncode\n```", ""])
+def test_preprocess_markdown_leaves_other_content(content):
+    assert utils.preprocess_markdown_for_pandoc(content) == content
+
+
+def _write_png(path, width=30, height=20):
+    import fitz
+
+    pix = fitz.Pixmap(fitz.csRGB, fitz.IRect(0, 0, width, height))
+    pix.clear_with(200)
+    path.write_bytes(pix.tobytes("png"))
+
+
+@pytest.mark.parametrize("name", ["image.png", "no_extension", "misnamed.jpg"])
+def test_convert_image_to_pdf_detects_content(tmp_path, name):
+    """没有扩展名或扩展名与内容不符的图片同样能按实际内容转换"""
+    import fitz
+
+    image_path = tmp_path / name
+    _write_png(image_path)
+    output = tmp_path / "out.pdf"
+
+    result = utils.convert_image_to_pdf(str(image_path), str(output))
+
+    assert result["success"], result
+    with fitz.open(str(output)) as doc:
+        assert len(doc) == 1
+        assert (doc[0].rect.width, doc[0].rect.height) == (22.5, 15.0)
+
+
+def test_single_and_batch_image_conversion_match(tmp_path):
+    import fitz
+
+    image_path = tmp_path / "image.png"
+    _write_png(image_path)
+    single, batch = tmp_path / "single.pdf", tmp_path / "batch.pdf"
+
+    assert utils.convert_image_to_pdf(str(image_path), str(single))["success"]
+    assert utils.convert_images_to_pdf([str(image_path)], str(batch))["success"]
+
+    with fitz.open(str(single)) as a, fitz.open(str(batch)) as b:
+        assert a.xref_length() == b.xref_length()
+        assert a[0].read_contents() == b[0].read_contents()
+        assert a.xref_stream_raw(a[0].get_contents()[0]) == b.xref_stream_raw(b[0].get_contents()[0])
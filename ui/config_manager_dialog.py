@@ -5,66 +5,121 @@
 
 import os
 import json
+import time
+import hashlib
+import threading
 from typing import Optional, List
 from PySide6.QtWidgets import (
     QDialog, QVBoxLayout, QHBoxLayout, QGridLayout, QFormLayout,
     QLabel, QLineEdit, QComboBox, QSpinBox, QDoubleSpinBox, QTextEdit,
     QPushButton, QTableWidget, QTableWidgetItem, QHeaderView,
-    QGroupBox, QTabWidget, QMessageBox, QFileDialog, QSplitter,
-    QFrame, QCheckBox, QProgressBar, QDialogButtonBox, QWidget
+    QGroupBox, QTabWidget, QMessageBox, QSplitter,
+    QFrame, QCheckBox, QProgressBar, QDialogButtonBox, QWidget, QApplication
 )
-from PySide6.QtCore import Qt, QThread, Signal, QTimer
-from PySide6.QtGui import QIcon, QFont
-import httpx
+from PySide6.QtCore import Qt, QObject, QThreadPool, Signal, QTimer, QSignalBlocker
+from PySide6.QtGui import QFont
+import shiboken6
 
 from core.config_models import APIConfig, ConfigProfile, ValidationResult, TestResult
 from core.config_manager import ConfigManager
+from core.utils import get_http_client
+from .custom_dialog import app_icon
 
+try:
+    from orjson import loads as _json_loads
+except ImportError:  # orjson 为可选依赖，未安装时使用标准库 json
+    _json_loads = json.loads
 
-class FetchModelsWorker(QThread):
-    """后台线程，用于获取模型列表"""
-    models_fetched = Signal(list)  # 成功获取模型列表时发出信号
-    error_occurred = Signal(str)   # 发生错误时发出信号
 
-    def __init__(self, api_base_url, api_key):
-        super().__init__()
-        self.api_base_url = api_base_url
-        self.api_key = api_key
+# 各API提供商的默认设置：默认基础URL、默认模型、是否允许修改URL、是否支持获取模型列表
+PROVIDER_PROFILES = {
+    "OpenAI-Compatible": {
+        "api_base_url": "https://api.openai.com/v1",
+        "model_name": "gpt-4o",
+        "base_url_editable": True,
+        "can_fetch_models": True,
+    },
+    "Mistral API": {
+        "api_base_url": "https://api.mistral.ai/v1",
+        "model_name": "mistral-ocr-latest",
+        # Mistral API有固定的地址和模型，无需获取模型列表
+        "base_url_editable": False,
+        "can_fetch_models": False,
+    },
+}
+# 未知提供商按OpenAI兼容处理
+_FALLBACK_PROVIDER_PROFILE = PROVIDER_PROFILES["OpenAI-Compatible"]
+# 所有提供商的默认值，用于判断当前输入是否仍是某个默认值（可被替换）
+_DEFAULT_API_BASE_URLS = frozenset(p["api_base_url"] for p in PROVIDER_PROFILES.values())
+_DEFAULT_MODEL_NAMES = frozenset(p["model_name"] for p in PROVIDER_PROFILES.values())
 
-    def run(self):
-        try:
-            headers = {
-                "Authorization": f"Bearer {self.api_key}"
-            }
-            with httpx.Client() as client:
-                response = client.get(
-                    f"{self.api_base_url.rstrip('/')}/models",
-                    headers=headers,
-                    timeout=10.0  # 10秒超时
-                )
-                response.raise_for_status()  # 如果状态码是 4xx 或 5xx，则引发异常
-            
-            data = response.json()
-            # 根据 OpenAI API 的响应格式，模型列表在 'data' 键下
-            # 并且每个模型对象有一个 'id' 键
-            models = [model['id'] for model in data.get('data', []) if 'id' in model]
-            self.models_fetched.emit(models)
-            
-        except Exception as e:
-            self.error_occurred.emit(str(e))
+# 模型列表缓存有效期（秒），以及 (API地址, API密钥哈希) -> (获取时间, 模型ID元组) 的缓存
+_MODEL_LIST_CACHE_TTL = 300
+_model_list_cache = {}
+# 多个对话框的后台任务可能同时读写缓存
+_model_list_cache_lock = threading.Lock()
 
-class ConnectionTestThread(QThread):
-    """连接测试线程"""
-    result_ready = Signal(object)
-    
-    def __init__(self, config_manager: ConfigManager, config: APIConfig):
+
+def _fetch_model_ids(api_base_url: str, api_key: str, use_cache: bool = True) -> List[str]:
+    """
+    请求 {api_base_url}/models 并返回模型ID列表（阻塞调用，需在后台线程中执行）。
+    同一地址和密钥在缓存有效期内直接返回缓存结果；请求失败时不写入缓存。
+    """
+    cache_key = (api_base_url.rstrip('/'), hashlib.sha256(api_key.encode("utf-8")).hexdigest())
+    if use_cache:
+        with _model_list_cache_lock:
+            cached = _model_list_cache.get(cache_key)
+        if cached and time.monotonic() - cached[0] < _MODEL_LIST_CACHE_TTL:
+            return list(cached[1])
+
+    headers = {
+        "Authorization": f"Bearer {api_key}"
+    }
+    # 复用共享客户端的连接池，重复获取时无需重新建立 TCP/TLS 连接
+    response = get_http_client().get(
+        f"{api_base_url.rstrip('/')}/models",
+        headers=headers,
+        timeout=10.0  # 10秒超时
+    )
+    response.raise_for_status()  # 如果状态码是 4xx 或 5xx，则引发异常
+
+    # 直接解析响应字节，省去先解码为字符串的步骤
+    data = _json_loads(response.content)
+    # 根据 OpenAI API 的响应格式，模型列表在 'data' 键下
+    # 并且每个模型对象有一个 'id' 键
+    models = [model['id'] for model in data.get('data', ()) if 'id' in model]
+    with _model_list_cache_lock:
+        _model_list_cache[cache_key] = (time.monotonic(), tuple(models))
+    return models
+
+
+class _ResultRelay(QObject):
+    """
+    常驻界面线程的中转对象：后台任务的结果经它排队回到界面线程再交给回调。
+    对话框可能在任务返回前被关闭销毁，此时丢弃结果，不再访问已删除的对象。
+    """
+
+    delivered = Signal(object, object, object)  # (接收对象, 回调, 结果)
+
+    def __init__(self):
         super().__init__()
-        self.config_manager = config_manager
-        self.config = config
-    
-    def run(self):
-        result = self.config_manager.test_connection(self.config)
-        self.result_ready.emit(result)
+        self.delivered.connect(self._deliver)
+
+    def _deliver(self, receiver, callback, value):
+        if shiboken6.isValid(receiver):
+            callback(value)
+
+
+_result_relay = None
+
+
+def _get_result_relay() -> _ResultRelay:
+    """获取中转对象（首次调用须在界面线程中，对象随之归属界面线程）"""
+    global _result_relay
+    if _result_relay is None:
+        _result_relay = _ResultRelay()
+    return _result_relay
+
 
 class ConfigManagerDialog(QDialog):
     """配置管理主对话框"""
@@ -76,11 +131,18 @@ class ConfigManagerDialog(QDialog):
         self.setWindowTitle("OCR API配置管理")
         self.setObjectName("ConfigManagerDialog")  # 设置对象名称以便样式应用
         self.setMinimumSize(900, 600)
-        self.setWindowIcon(QIcon("ui/app.ico"))
+        icon = app_icon()
+        if icon is not None:
+            self.setWindowIcon(icon)
         
         self.config_manager = ConfigManager()
         self.current_config = None
-        self.test_thread = None
+        self._configs_by_id = {}
+        # 上次应用默认值时的提供商，只有提供商真正改变时才用其默认值替换地址和模型
+        self._current_provider = None
+        
+        # 后台任务在全局线程池中执行，结果经常驻的中转对象回到界面线程
+        self._relay = _get_result_relay()
         
         self._init_ui()
         self._load_configs()
@@ -243,13 +305,11 @@ class ConfigManagerDialog(QDialog):
         fetch_models_layout = QHBoxLayout()
         fetch_models_layout.addStretch()
         self.fetch_models_btn = QPushButton("获取模型列表")
+        self.fetch_models_btn.setToolTip("按住 Shift 点击可忽略缓存，重新获取模型列表")
         self.fetch_models_btn.clicked.connect(self._fetch_models)
         fetch_models_layout.addWidget(self.fetch_models_btn)
         form_layout.addRow("", fetch_models_layout)
         
-        # 添加后台线程实例变量
-        self.fetch_models_worker = None
-        
         # OCR提示词
         self.prompt_edit = QTextEdit()
         self.prompt_edit.setMaximumHeight(100)
@@ -287,54 +347,62 @@ class ConfigManagerDialog(QDialog):
     def _load_configs(self):
         """加载配置列表"""
         profile = self.config_manager.load_configs()
+        # 按ID索引当前列表中的配置，选中行时直接查找，无需重新加载配置文件
+        self._configs_by_id = {config.id: config for config in profile.configs}
         
-        self.config_table.setRowCount(len(profile.configs))
-        
-        for row, config in enumerate(profile.configs):
-            # 名称
-            name_item = QTableWidgetItem(config.name)
-            self.config_table.setItem(row, 0, name_item)
-            
-            # 提供商
-            provider_item = QTableWidgetItem(config.provider)
-            self.config_table.setItem(row, 1, provider_item)
-            
-            # 默认标记
-            default_item = QTableWidgetItem("是" if config.is_default else "否")
-            self.config_table.setItem(row, 2, default_item)
-            
-            # 存储配置ID
-            name_item.setData(Qt.UserRole, config.id)
+        # 填充期间暂停重绘并屏蔽选择变化信号，避免逐个 setItem 触发重绘和重复加载编辑器
+        self.config_table.setUpdatesEnabled(False)
+        try:
+            with QSignalBlocker(self.config_table):
+                # 先一次性清空旧行，再按新数量建行，避免逐个 setItem 覆盖时逐个销毁旧单元格
+                self.config_table.setRowCount(0)
+                self.config_table.setRowCount(len(profile.configs))
+                
+                for row, config in enumerate(profile.configs):
+                    # 名称
+                    name_item = QTableWidgetItem(config.name)
+                    # 存储配置ID
+                    name_item.setData(Qt.UserRole, config.id)
+                    self.config_table.setItem(row, 0, name_item)
+                    
+                    # 提供商
+                    provider_item = QTableWidgetItem(config.provider)
+                    self.config_table.setItem(row, 1, provider_item)
+                    
+                    # 默认标记
+                    default_item = QTableWidgetItem("是" if config.is_default else "否")
+                    self.config_table.setItem(row, 2, default_item)
+                
+                # 如果有默认配置，自动选中
+                self._select_config_row(profile.get_default_config())
+        finally:
+            self.config_table.setUpdatesEnabled(True)
         
-        # 如果有默认配置，自动选中
-        default_config = profile.get_default_config()
-        if default_config:
+        # 按最终的选中状态刷新一次编辑器
+        self._on_config_selected()
+    
+    def _select_config_row(self, config: Optional[APIConfig]) -> bool:
+        """在表格中选中指定配置所在的行，找到时返回 True"""
+        if config:
             for row in range(self.config_table.rowCount()):
                 item = self.config_table.item(row, 0)
-                if item and item.data(Qt.UserRole) == default_config.id:
+                if item and item.data(Qt.UserRole) == config.id:
                     self.config_table.selectRow(row)
-                    break
+                    return True
+        return False
     
     def _select_default_config(self):
         """选择并加载默认配置"""
         profile = self.config_manager.load_configs()
-        default_config = profile.get_default_config()
         
-        if default_config:
-            # 在表格中找到默认配置并选中
-            for row in range(self.config_table.rowCount()):
-                item = self.config_table.item(row, 0)
-                if item and item.data(Qt.UserRole) == default_config.id:
-                    self.config_table.selectRow(row)
-                    
-                    # 触发配置选择事件以加载配置到编辑器
-                    self._on_config_selected()
-                    break
-        else:
-            # 如果没有默认配置，可以选择第一个配置或保持空白
-            if self.config_table.rowCount() > 0:
-                self.config_table.selectRow(0)
-                self._on_config_selected()
+        # 屏蔽选择变化信号，选中后只显式加载一次配置到编辑器
+        with QSignalBlocker(self.config_table):
+            if not self._select_config_row(profile.get_default_config()):
+                # 如果没有默认配置，可以选择第一个配置或保持空白
+                if self.config_table.rowCount() > 0:
+                    self.config_table.selectRow(0)
+        
+        self._on_config_selected()
     
     def _on_config_selected(self):
         """配置选择事件"""
@@ -348,9 +416,7 @@ class ConfigManagerDialog(QDialog):
         
         row = selected_items[0].row()
         config_id = self.config_table.item(row, 0).data(Qt.UserRole)
-        
-        profile = self.config_manager.load_configs()
-        config = profile.get_config(config_id)
+        config = self._configs_by_id.get(config_id)
         
         if config:
             self._load_config_to_editor(config)
@@ -366,7 +432,9 @@ class ConfigManagerDialog(QDialog):
         self.current_config = config
         
         self.name_edit.setText(config.name or "")
-        self.provider_combo.setCurrentText(config.provider or "")
+        # 屏蔽信号：载入已保存的配置不是用户切换提供商，不能用默认值覆盖其中的地址和模型
+        with QSignalBlocker(self.provider_combo):
+            self.provider_combo.setCurrentText(config.provider or "")
         self.api_key_edit.setText(config.api_key or "")
         self.api_base_edit.setText(config.api_base_url or "")
         self.model_edit.setText(config.model_name or "")
@@ -375,9 +443,8 @@ class ConfigManagerDialog(QDialog):
         self.prompt_edit.setPlainText(config.prompt or "")
         self.is_default_check.setChecked(config.is_default or False)
         
-        self._on_provider_changed(config.provider)
-        # 更新获取模型按钮状态
-        self._update_fetch_button_state()
+        self._current_provider = config.provider
+        self._apply_provider_controls(config.provider)
     
     def _clear_editor(self):
         """清空编辑器"""
@@ -396,35 +463,29 @@ class ConfigManagerDialog(QDialog):
         self.test_result_label.setText("点击\"测试连接\"按钮测试API配置")
     
     def _on_provider_changed(self, provider: str):
-        """提供商改变事件"""
-        if provider == "Mistral API":
-            # 只在当前API基础URL为空或为默认值时设置
-            if not self.api_base_edit.text() or self.api_base_edit.text() == "https://api.openai.com/v1":
-                self.api_base_edit.setText("https://api.mistral.ai/v1")
-            self.api_base_edit.setEnabled(False)
-            # 只在当前模型名称为空或为默认值时设置
-            if not self.model_edit.text() or self.model_edit.text() == "gpt-4o":
-                self.model_edit.setText("mistral-ocr-latest")
-            # 为Mistral API禁用获取模型按钮，因为Mistral API有固定的模型
-            self.fetch_models_btn.setEnabled(False)
-        else:  # OpenAI-Compatible
-            # 只在当前API基础URL为空或为默认值时设置
-            if not self.api_base_edit.text() or self.api_base_edit.text() == "https://api.mistral.ai/v1":
-                self.api_base_edit.setText("https://api.openai.com/v1")
-            self.api_base_edit.setEnabled(True)
-            # 只在当前模型名称为空或为默认值时设置
-            if not self.model_edit.text() or self.model_edit.text() == "mistral-ocr-latest":
-                self.model_edit.setText("gpt-4o")
-            # 为OpenAI兼容模式启用获取模型按钮
-            self.fetch_models_btn.setEnabled(True)
+        """提供商改变事件：提供商与上次相同时不做任何改动"""
+        if provider == self._current_provider:
+            return
+        self._current_provider = provider
+        profile = PROVIDER_PROFILES.get(provider, _FALLBACK_PROVIDER_PROFILE)
+        # 只在当前API基础URL为空或为某个提供商的默认值时设置
+        if self.api_base_edit.text() in _DEFAULT_API_BASE_URLS or not self.api_base_edit.text():
+            self.api_base_edit.setText(profile["api_base_url"])
+        # 只在当前模型名称为空或为某个提供商的默认值时设置
+        if self.model_edit.text() in _DEFAULT_MODEL_NAMES or not self.model_edit.text():
+            self.model_edit.setText(profile["model_name"])
+        self._apply_provider_controls(provider)
+
+    def _apply_provider_controls(self, provider: str):
+        """按提供商设置地址输入框与获取模型按钮是否可用，不改动输入框内容"""
+        profile = PROVIDER_PROFILES.get(provider, _FALLBACK_PROVIDER_PROFILE)
+        self.api_base_edit.setEnabled(profile["base_url_editable"])
+        self.fetch_models_btn.setEnabled(profile["can_fetch_models"])
     
     def _update_fetch_button_state(self):
         """更新获取模型按钮状态"""
-        provider = self.provider_combo.currentText()
-        if provider == "Mistral API":
-            self.fetch_models_btn.setEnabled(False)
-        else:  # OpenAI-Compatible
-            self.fetch_models_btn.setEnabled(True)
+        profile = PROVIDER_PROFILES.get(self.provider_combo.currentText(), _FALLBACK_PROVIDER_PROFILE)
+        self.fetch_models_btn.setEnabled(profile["can_fetch_models"])
             
     def _fetch_models(self):
         """获取模型列表"""
@@ -435,16 +496,27 @@ class ConfigManagerDialog(QDialog):
             QMessageBox.warning(self, "警告", "请先输入API基础URL和API密钥")
             return
             
-        # 启动后台线程获取模型列表
-        self.fetch_models_worker = FetchModelsWorker(api_base_url, api_key)
-        self.fetch_models_worker.models_fetched.connect(self._on_models_fetched)
-        self.fetch_models_worker.error_occurred.connect(self._on_fetch_error)
+        # 按住 Shift 点击时强制刷新，不使用缓存的模型列表
+        use_cache = not (QApplication.keyboardModifiers() & Qt.ShiftModifier)
         
         # 禁用按钮和编辑器，防止重复点击
         self.fetch_models_btn.setEnabled(False)
         self.fetch_models_btn.setText("获取中...")
         
-        self.fetch_models_worker.start()
+        relay = self._relay
+        on_fetched = self._on_models_fetched
+        on_error = self._on_fetch_error
+
+        def fetch():
+            try:
+                models = _fetch_model_ids(api_base_url, api_key, use_cache)
+            except Exception as e:
+                relay.delivered.emit(self, on_error, str(e))
+                return
+            relay.delivered.emit(self, on_fetched, models)
+        
+        # 在全局线程池中获取模型列表，复用已有线程，无需每次点击都新建线程
+        QThreadPool.globalInstance().start(fetch)
     
     def _on_models_fetched(self, models):
         """模型列表获取成功回调"""
@@ -526,9 +598,6 @@ class ConfigManagerDialog(QDialog):
             QMessageBox.warning(self, "配置验证失败", "\n".join(validation.errors))
             return
         
-        # 更新获取模型按钮状态
-        self._update_fetch_button_state()
-        
         # 保存配置
         profile = self.config_manager.load_configs()
         
@@ -548,21 +617,13 @@ class ConfigManagerDialog(QDialog):
             self._load_configs()
             self.config_changed.emit()
             QMessageBox.information(self, "成功", "配置保存成功")
-            
-            # 更新获取模型按钮状态
-            self._update_fetch_button_state()
         else:
             QMessageBox.critical(self, "错误", "配置保存失败")
-            
-            # 更新获取模型按钮状态
-            self._update_fetch_button_state()
     
     def _cancel_edit(self):
         """取消编辑"""
         self._load_configs()
         self._clear_editor()
-        # 更新获取模型按钮状态
-        self._update_fetch_button_state()
     
     def _delete_config(self):
         """删除配置"""
@@ -590,9 +651,6 @@ class ConfigManagerDialog(QDialog):
                     QMessageBox.information(self, "成功", "配置删除成功")
                 else:
                     QMessageBox.critical(self, "错误", "配置删除失败")
-                
-                # 更新获取模型按钮状态
-                self._update_fetch_button_state()
     
     def _set_default_config(self):
         """设置默认配置"""
@@ -611,9 +669,6 @@ class ConfigManagerDialog(QDialog):
                 QMessageBox.information(self, "成功", "默认配置设置成功")
             else:
                 QMessageBox.critical(self, "错误", "默认配置设置失败")
-            
-            # 更新获取模型按钮状态
-            self._update_fetch_button_state()
     
     def _test_connection(self):
         """测试连接"""
@@ -640,19 +695,19 @@ class ConfigManagerDialog(QDialog):
             QMessageBox.warning(self, "配置验证失败", "\n".join(validation.errors))
             return
         
-        # 更新获取模型按钮状态
-        self._update_fetch_button_state()
-        
         # 开始测试
         self.test_progress.setVisible(True)
         self.test_progress.setRange(0, 0)  # 无限进度条
         self.test_result_label.setText("正在测试连接...")
         self.test_btn.setEnabled(False)
         
-        # 启动测试线程
-        self.test_thread = ConnectionTestThread(self.config_manager, config)
-        self.test_thread.result_ready.connect(self._on_test_result)
-        self.test_thread.start()
+        # 在全局线程池中执行连接测试
+        config_manager = self.config_manager
+        relay = self._relay
+        on_result = self._on_test_result
+        QThreadPool.globalInstance().start(
+            lambda: relay.delivered.emit(self, on_result, config_manager.test_connection(config))
+        )
     
     def _on_test_result(self, result: TestResult):
         """测试结果回调"""
@@ -677,6 +732,7 @@ class ConfigManagerDialog(QDialog):
     
     def _import_configs(self):
         """导入配置"""
+        from PySide6.QtWidgets import QFileDialog
         file_path, _ = QFileDialog.getOpenFileName(
             self, "导入配置", "", "JSON文件 (*.json)"
         )
@@ -705,12 +761,10 @@ class ConfigManagerDialog(QDialog):
                 )
             else:
                 QMessageBox.critical(self, "导入失败", "无法导入配置文件")
-            
-            # 更新获取模型按钮状态
-            self._update_fetch_button_state()
     
     def _export_configs(self):
         """导出配置"""
+        from PySide6.QtWidgets import QFileDialog
         file_path, _ = QFileDialog.getSaveFileName(
             self, "导出配置", "ocr_configs.json", "JSON文件 (*.json)"
         )
@@ -719,7 +773,4 @@ class ConfigManagerDialog(QDialog):
             if self.config_manager.export_configs(file_path):
                 QMessageBox.information(self, "导出成功", "配置导出成功")
             else:
-                QMessageBox.critical(self, "导出失败", "无法导出配置文件")
-            
-            # 更新获取模型按钮状态
-            self._update_fetch_button_state()
\ No newline at end of file
+                QMessageBox.critical(self, "导出失败", "无法导出配置文件")
\ No newline at end of file
@@ -1,90 +1,115 @@
 from PySide6.QtWidgets import QMessageBox, QPushButton
 from PySide6.QtGui import QIcon
 from PySide6.QtCore import Qt
+import functools
 import os
 import sys
 
+# 资源根目录在导入时确定一次：PyInstaller 打包后为 _MEIPASS 临时目录，否则为当前工作目录
+_BASE_PATH = getattr(sys, "_MEIPASS", None) or os.path.abspath(".")
+
+@functools.lru_cache(maxsize=None)
 def resource_path(relative_path):
-    """ Get absolute path to resource, works for dev and for PyInstaller """
-    try:
-        # PyInstaller creates a temp folder and stores path in _MEIPASS
-        base_path = sys._MEIPASS
-    except Exception:
-        base_path = os.path.abspath(".")
-    return os.path.join(base_path, relative_path)
+    """获取资源的绝对路径，开发环境与 PyInstaller 打包后均适用"""
+    return os.path.join(_BASE_PATH, relative_path)
+
+# 应用图标路径在导入时解析一次；QIcon 需在 QApplication 创建后构造，首次使用时再创建并缓存
+_APP_ICON_PATH = resource_path("ui/app.ico")
+_APP_ICON_EXISTS = os.path.exists(_APP_ICON_PATH)
+_APP_ICON = None
+
+def app_icon():
+    """返回缓存的应用图标，图标文件不存在时返回 None"""
+    global _APP_ICON
+    if _APP_ICON is None and _APP_ICON_EXISTS:
+        _APP_ICON = QIcon(_APP_ICON_PATH)
+    return _APP_ICON
+
+# 消息框样式表，所有 CustomMessageBox 实例共用同一个字符串常量
+_MESSAGE_BOX_STYLE = """
+    QMessageBox {
+        background-color: rgba(255, 255, 255, 0.98);
+    }
+    QLabel {
+        color: #1a2332;
+        font-size: 11pt;
+    }
+    QPushButton {
+        background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
+                                    stop:0 #3b82f6, stop:1 #2563eb);
+        color: #ffffff;
+        border: none;
+        padding: 10px 18px;
+        border-radius: 10px;
+        min-width: 90px;
+        font-weight: 600;
+    }
+    QPushButton:hover {
+        background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
+                                    stop:0 #60a5fa, stop:1 #3b82f6);
+    }
+    QPushButton:pressed {
+        background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
+                                    stop:0 #2563eb, stop:1 #1d4ed8);
+    }
+"""
 
 class CustomMessageBox(QMessageBox):
     def __init__(self, parent=None):
         super().__init__(parent)
         self.setWindowTitle("提示")
-        icon_path = resource_path("ui/app.ico")
-        if os.path.exists(icon_path):
-            self.setWindowIcon(QIcon(icon_path))
-
-        self.setStyleSheet("""
-            QMessageBox {
-                background-color: rgba(255, 255, 255, 0.98);
-            }
-            QLabel {
-                color: #1a2332;
-                font-size: 11pt;
-            }
-            QPushButton {
-                background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
-                                            stop:0 #3b82f6, stop:1 #2563eb);
-                color: #ffffff;
-                border: none;
-                padding: 10px 18px;
-                border-radius: 10px;
-                min-width: 90px;
-                font-weight: 600;
-            }
-            QPushButton:hover {
-                background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
-                                            stop:0 #60a5fa, stop:1 #3b82f6);
-            }
-            QPushButton:pressed {
-                background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
-                                            stop:0 #2563eb, stop:1 #1d4ed8);
-            }
-        """)
+        icon = app_icon()
+        if icon is not None:
+            self.setWindowIcon(icon)
+
+        self.setStyleSheet(_MESSAGE_BOX_STYLE)
 
     @staticmethod
     def information(parent, title, text):
-        msg_box = CustomMessageBox(parent)
-        msg_box.setWindowTitle(title)
-        msg_box.setText(text)
-        msg_box.setIcon(QMessageBox.Icon.Information)
-        msg_box.exec()
+        show_info(parent, title, text)
 
     @staticmethod
     def warning(parent, title, text):
-        msg_box = CustomMessageBox(parent)
-        msg_box.setWindowTitle(title)
-        msg_box.setText(text)
-        msg_box.setIcon(QMessageBox.Icon.Warning)
-        msg_box.exec()
+        show_warning(parent, title, text)
 
     @staticmethod
     def critical(parent, title, text):
-        msg_box = CustomMessageBox(parent)
-        msg_box.setWindowTitle(title)
-        msg_box.setText(text)
-        msg_box.setIcon(QMessageBox.Icon.Critical)
-        msg_box.exec()
+        show_critical(parent, title, text)
 
     @staticmethod
     def about(parent, title, text):
-        msg_box = CustomMessageBox(parent)
-        msg_box.setTextFormat(Qt.TextFormat.RichText)
-        msg_box.setWindowTitle(title)
-        msg_box.setText(text)
-        msg_box.setIcon(QMessageBox.Icon.NoIcon)
-        msg_box.exec()
-
-from PySide6.QtWidgets import QDialog, QVBoxLayout, QHBoxLayout, QPushButton, QTableWidget, QTableWidgetItem, QLabel, QLineEdit, QMessageBox
+        show_about(parent, title, text)
+
+def _make_msgbox(parent, title, text, icon, text_format=None):
+    """创建模态消息框，关闭后立即销毁，避免消息框一直挂在父窗口下随弹窗次数累积"""
+    msg_box = CustomMessageBox(parent)
+    msg_box.setAttribute(Qt.WidgetAttribute.WA_DeleteOnClose, True)
+    if text_format is not None:
+        msg_box.setTextFormat(text_format)
+    msg_box.setWindowTitle(title)
+    msg_box.setText(text)
+    msg_box.setIcon(icon)
+    return msg_box
+
+def show_info(parent, title, text):
+    _make_msgbox(parent, title, text, QMessageBox.Icon.Information).exec()
+
+def show_warning(parent, title, text):
+    _make_msgbox(parent, title, text, QMessageBox.Icon.Warning).exec()
+
+def show_critical(parent, title, text):
+    _make_msgbox(parent, title, text, QMessageBox.Icon.Critical).exec()
+
+def show_about(parent, title, text):
+    _make_msgbox(parent, title, text, QMessageBox.Icon.NoIcon, Qt.TextFormat.RichText).exec()
+
+from PySide6.QtWidgets import QDialog, QVBoxLayout, QHBoxLayout, QPushButton, QTableWidget, QTableWidgetItem, QLabel, QLineEdit, QMessageBox, QAbstractItemView
 from PySide6.QtCore import Qt
 
+# 书签行解析结果的哨兵值
+_ROW_EMPTY = object()
+_ROW_INVALID = object()
+
 class BookmarkEditDialog(QDialog):
     def __init__(self, parent=None, bookmarks=None, is_new=False):
         super().__init__(parent)
@@ -93,6 +118,8 @@ class BookmarkEditDialog(QDialog):
         self.bookmarks = bookmarks or []
         self.is_new = is_new
         self.result_bookmarks = None  # 存储最终的书签结果
+        # 行号 -> 解析结果缓存，单元格修改时失效对应行，增删行时整体失效
+        self._row_cache = {}
         self._setup_ui()
         self._load_bookmarks()
 
@@ -109,6 +136,11 @@ class BookmarkEditDialog(QDialog):
         self.table.setHorizontalHeaderLabels(["页码", "书签内容"])
         self.table.horizontalHeader().setStretchLastSection(True)
         self.table.verticalHeader().setDefaultSectionSize(36)
+        # 按整行选择，删除时可直接从选择模型取得选中的行
+        self.table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.table.itemChanged.connect(self._on_item_changed)
+        self.table.model().rowsInserted.connect(self._clear_row_cache)
+        self.table.model().rowsRemoved.connect(self._clear_row_cache)
         layout.addWidget(self.table)
 
         btn_layout = QHBoxLayout()
@@ -136,11 +168,16 @@ class BookmarkEditDialog(QDialog):
 
     def _load_bookmarks(self):
         self.table.setRowCount(len(self.bookmarks))
-        for i, bm in enumerate(self.bookmarks):
-            page_item = QTableWidgetItem(str(bm.get("page", "")))
-            content_item = QTableWidgetItem(bm.get("title", ""))
-            self.table.setItem(i, 0, page_item)
-            self.table.setItem(i, 1, content_item)
+        # 填充期间暂停重绘，结束后统一刷新一次
+        self.table.setUpdatesEnabled(False)
+        try:
+            for i, bm in enumerate(self.bookmarks):
+                page_item = QTableWidgetItem(str(bm.get("page", "")))
+                content_item = QTableWidgetItem(bm.get("title", ""))
+                self.table.setItem(i, 0, page_item)
+                self.table.setItem(i, 1, content_item)
+        finally:
+            self.table.setUpdatesEnabled(True)
         
         # 如果是新增书签模式且没有书签，自动添加一个空行
         if self.is_new and self.table.rowCount() == 0:
@@ -153,45 +190,58 @@ class BookmarkEditDialog(QDialog):
         self.table.setItem(row, 1, QTableWidgetItem(""))
 
     def delete_row(self):
-        selected = self.table.selectedItems()
-        if not selected:
+        indexes = self.table.selectionModel().selectedRows()
+        if not indexes:
             QMessageBox.warning(self, "提示", "请先选中要删除的行！")
             return
-        rows = set(item.row() for item in selected)
+        rows = [index.row() for index in indexes]
         for row in sorted(rows, reverse=True):
             self.table.removeRow(row)
 
+    def _on_item_changed(self, item):
+        self._row_cache.pop(item.row(), None)
+
+    def _clear_row_cache(self, *args):
+        self._row_cache.clear()
+
+    def _parse_row(self, row):
+        """解析一行数据，返回 (page, title)、_ROW_EMPTY 或 _ROW_INVALID"""
+        page_item = self.table.item(row, 0)
+        title_item = self.table.item(row, 1)
+        page_text = page_item.text().strip() if page_item else ""
+        title = title_item.text().strip() if title_item else ""
+
+        # 跳过完全空白的行
+        if not page_text and not title:
+            return _ROW_EMPTY
+
+        # 验证数据
+        try:
+            page = int(page_text)
+        except ValueError:
+            return _ROW_INVALID
+        if page <= 0 or not title:
+            return _ROW_INVALID
+        return page, title
+
     def _validate_and_collect_bookmarks(self):
         """验证并收集书签数据"""
         bookmarks = []
         error_rows = []
+        row_cache = self._row_cache
 
         for row in range(self.table.rowCount()):
-            page_item = self.table.item(row, 0)
-            title_item = self.table.item(row, 1)
-            
-            # 跳过完全空白的行
-            if (not page_item or not page_item.text().strip()) and \
-               (not title_item or not title_item.text().strip()):
+            parsed = row_cache.get(row)
+            if parsed is None:
+                parsed = row_cache[row] = self._parse_row(row)
+
+            if parsed is _ROW_EMPTY:
                 continue
-                
-            # 验证数据
-            try:
-                page = int(page_item.text() if page_item else "")
-                title = title_item.text().strip() if title_item else ""
-                
-                if page <= 0:
-                    error_rows.append(row + 1)
-                    continue
-                    
-                if not title:
-                    error_rows.append(row + 1)
-                    continue
-                    
-                bookmarks.append({"page": page, "title": title})
-                
-            except ValueError:
+            if parsed is _ROW_INVALID:
                 error_rows.append(row + 1)
+                continue
+            page, title = parsed
+            bookmarks.append({"page": page, "title": title})
         
         return bookmarks, error_rows
 
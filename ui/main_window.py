@@ -6,12 +6,20 @@ from PySide6.QtWidgets import (
     QTabWidget, QMenu, QCheckBox, QDialog, QLineEdit, QTextEdit, QFormLayout,
     QSplitter, QStackedWidget, QGraphicsOpacityEffect
 )
-from PySide6.QtCore import Qt, QThread, Signal, QMimeData, QUrl, QMetaObject, QPropertyAnimation, QEasingCurve
-from PySide6.QtGui import QDropEvent, QIcon, QDesktopServices, QColor
+from PySide6.QtCore import Qt, QThread, QThreadPool, Signal, QMimeData, QUrl, QMetaObject, QPropertyAnimation, QEasingCurve, QTimer
+from PySide6.QtGui import QDropEvent, QDesktopServices, QColor
 import os
 import re
 import time
 import logging
+import contextlib
+import functools
+import multiprocessing
+import signal
+import threading
+from pathlib import Path
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, as_completed, wait
+from concurrent.futures.process import BrokenProcessPool
 from datetime import datetime
 
 
@@ -53,12 +61,30 @@ from core import (
     __version__,
     batch_add_bookmarks_to_pdfs
 )
+from core.utils import remove_partial_output, report_process_pid, throttle_progress
 from core.ocr import process_images_with_model, get_default_config, get_available_configs
-from .custom_dialog import CustomMessageBox, BookmarkEditDialog
+from .custom_dialog import CustomMessageBox, BookmarkEditDialog, app_icon
 from .config_manager_dialog import ConfigManagerDialog
 import json
 import dotenv
 
+@contextlib.contextmanager
+def batched_table_update(table):
+    """
+    批量修改表格：期间暂停排序和重绘，结束后统一刷新一次视图。
+    模型信号照常发出，表头以及 SortableTableWidget 的路径缓存随之保持同步。
+    """
+    sorting_enabled = table.isSortingEnabled()
+    table.setSortingEnabled(False)
+    table.setUpdatesEnabled(False)
+    try:
+        yield table
+    finally:
+        table.setSortingEnabled(sorting_enabled)
+        table.setUpdatesEnabled(True)
+        table.viewport().update()
+
+
 class SortableTableWidget(QTableWidget):
     """
     可拖拽排序的表格组件
@@ -72,6 +98,31 @@ class SortableTableWidget(QTableWidget):
         self.setDragDropMode(QAbstractItemView.DragDropMode.InternalMove)
         self.viewport().setAcceptDrops(True)
         self.setDropIndicatorShown(True)
+        # 第一列中保存的文件路径列表缓存，行增删、移动或第一列数据变化时失效
+        self._file_paths = None
+        model = self.model()
+        for signal in (model.rowsInserted, model.rowsRemoved, model.rowsMoved,
+                       model.modelReset, model.layoutChanged):
+            signal.connect(self._invalidate_file_paths)
+        model.dataChanged.connect(self._on_model_data_changed)
+
+    def _invalidate_file_paths(self, *args):
+        self._file_paths = None
+
+    def _on_model_data_changed(self, top_left, bottom_right, roles=()):
+        if top_left.column() == 0:
+            self._file_paths = None
+
+    def file_paths(self):
+        """按当前行顺序返回第一列保存的文件路径列表（返回副本，结果在表格变化前复用）"""
+        if self._file_paths is None:
+            user_role = Qt.ItemDataRole.UserRole
+            paths = []
+            for row in range(self.rowCount()):
+                item = self.item(row, 0)
+                paths.append(item.data(user_role) if item else None)
+            self._file_paths = paths
+        return list(self._file_paths)
 
     def dragEnterEvent(self, event):
         """处理拖拽进入事件"""
@@ -90,44 +141,36 @@ class SortableTableWidget(QTableWidget):
     def dropEvent(self, event: 'QDropEvent'):
         if not event.isAccepted() and event.source() == self:
             drop_row = self.drop_on_row(event)
-            rows = sorted(list(set(item.row() for item in self.selectedItems())))
-            rows_to_move = []
-            for row in rows:
-                row_data = []
-                for column in range(self.columnCount()):
-                    item = self.item(row, column)
-                    if item:
-                        # 克隆项目以避免移动相同的项目实例
-                        clone_item = QTableWidgetItem(item)
-                        # 如果存在用户数据则复制
-                        for role in range(Qt.ItemDataRole.UserRole, Qt.ItemDataRole.UserRole + 100):
-                            data = item.data(role)
-                            if data is not None:
-                                clone_item.setData(role, data)
-                        row_data.append(clone_item)
-                    else:
-                        row_data.append(None)
-                rows_to_move.append(row_data)
-
-            # 为从上方移动的项目调整放置行
-            for row in reversed(rows):
-                self.removeRow(row)
-                if row < drop_row:
-                    drop_row -= 1
-            
-            # 在新位置插入行
-            for row_index, row_data in enumerate(rows_to_move):
-                row = drop_row + row_index
-                self.insertRow(row)
-                for column, item in enumerate(row_data):
-                    if item:
-                        self.setItem(row, column, item)
-
-            # 重新选择移动的行
-            self.clearSelection()
-            for row_index in range(len(rows_to_move)):
-                self.selectRow(drop_row + row_index)
-            
+            # 整行选择模式下直接从选择模型取选中行，无需遍历每个选中单元格
+            rows = sorted(index.row() for index in self.selectionModel().selectedRows())
+            # 移动期间暂停排序和重绘，所有行移动完成后只刷新一次视图；中途出错也会恢复重绘
+            with batched_table_update(self):
+                # 直接取出原有单元格（所有权转移给调用方），插入新位置后复用，无需逐列克隆和复制数据
+                column_count = self.columnCount()
+                rows_to_move = [
+                    [self.takeItem(row, column) for column in range(column_count)]
+                    for row in rows
+                ]
+
+                # 为从上方移动的项目调整放置行
+                for row in reversed(rows):
+                    self.removeRow(row)
+                    if row < drop_row:
+                        drop_row -= 1
+
+                # 在新位置插入行
+                for row_index, row_data in enumerate(rows_to_move):
+                    row = drop_row + row_index
+                    self.insertRow(row)
+                    for column, item in enumerate(row_data):
+                        if item:
+                            self.setItem(row, column, item)
+
+                # 重新选择移动的行
+                self.clearSelection()
+                for row_index in range(len(rows_to_move)):
+                    self.selectRow(drop_row + row_index)
+
             event.accept()
         super().dropEvent(event)
 
@@ -147,6 +190,15 @@ class SortableTableWidget(QTableWidget):
         # 检查放置位置是否在行的下半部分
         return pos.y() - rect.top() > rect.height() / 2
 
+    def set_cell_text(self, row, column, text):
+        """更新单元格文本，已有单元格时复用原 QTableWidgetItem 而不是重新分配"""
+        item = self.item(row, column)
+        if item is None:
+            self.setItem(row, column, QTableWidgetItem(text))
+        elif item.text() != text:
+            item.setText(text)
+        return self.item(row, column)
+
     def keyPressEvent(self, event):
         """处理按键事件"""
         if event.key() == Qt.Key.Key_Delete:
@@ -307,11 +359,26 @@ class SortableTableWidget(QTableWidget):
         for row in sorted(list(selected_rows), reverse=True):
             self.removeRow(row)
 
+# 资源根目录在导入时确定一次：PyInstaller 打包后为 _MEIPASS 临时目录，否则为当前工作目录
+_BASE_PATH = getattr(sys, "_MEIPASS", None) or os.path.abspath(".")
+
+@functools.lru_cache(maxsize=None)
 def resource_path(relative_path):
     """获取资源的绝对路径"""
-    if hasattr(sys, '_MEIPASS'):
-        return os.path.join(sys._MEIPASS, relative_path)
-    return os.path.join(os.path.abspath("."), relative_path)
+    return os.path.join(_BASE_PATH, relative_path)
+
+@functools.lru_cache(maxsize=None)
+def _load_qss(style_path):
+    """读取样式表并把其中的相对资源路径替换为绝对路径，结果缓存，文件不存在时返回空字符串"""
+    try:
+        qss = Path(style_path).read_text(encoding="utf-8")
+    except FileNotFoundError:
+        return ""
+    # 将QSS中的相对路径替换为绝对路径，确保图标资源能正确加载
+    base_dir = resource_path("").replace("\\", "/")
+    if not base_dir.endswith("/"):
+        base_dir += "/"
+    return qss.replace("url(ui/", f"url({base_dir}ui/")
 
 
 class AnimatedProgressBar(QProgressBar):
@@ -340,6 +407,64 @@ def _create_empty_state_hint(text="拖拽PDF文件到此处，或点击上方按
     return hint
 
 
+# 批量优化、转曲时同时运行的 Ghostscript 进程数上限：每个进程单线程占满一个核心，超过核心数不会更快；
+# 处理大文件时每个进程还要占用不少内存并争用磁盘，因此最多 4 个
+_MAX_PARALLEL_FILES = min(4, os.cpu_count() or 1)
+# PyMuPDF/pikepdf 处理在子进程中并行时的最大进程数：保留一个核心给界面线程，并限制内存占用
+_MAX_PARALLEL_PROCESSES = max(1, min(4, (os.cpu_count() or 1) - 1))
+
+# 标准引擎并行优化使用的进程池：首次使用时创建并在多次任务间复用，停止任务或进程池损坏时丢弃
+_process_pool = None
+# 当前进程池子进程的 PID 队列，子进程启动时由 report_process_pid 写入
+_process_pool_pids = None
+_process_pool_lock = threading.Lock()
+
+
+def _get_process_pool():
+    """返回共用的进程池，不存在时创建"""
+    global _process_pool, _process_pool_pids
+    with _process_pool_lock:
+        if _process_pool is None:
+            # 使用 spawn 启动子进程，避免在已有 Qt 线程的进程中 fork
+            context = multiprocessing.get_context("spawn")
+            _process_pool_pids = context.SimpleQueue()
+            _process_pool = ProcessPoolExecutor(
+                max_workers=_MAX_PARALLEL_PROCESSES,
+                mp_context=context,
+                initializer=report_process_pid,
+                initargs=(_process_pool_pids,)
+            )
+        return _process_pool
+
+
+def _discard_process_pool(pool):
+    """
+    丢弃进程池并取消其中尚未开始的任务，下次使用时重新创建。
+    返回该进程池的子进程 PID 队列；进程池已被丢弃过时返回 None。
+    """
+    global _process_pool, _process_pool_pids
+    pid_queue = None
+    with _process_pool_lock:
+        if _process_pool is pool:
+            pid_queue = _process_pool_pids
+            _process_pool = None
+            _process_pool_pids = None
+    pool.shutdown(wait=False, cancel_futures=True)
+    return pid_queue
+
+
+def _terminate_process_pool(pool):
+    """丢弃进程池并立即终止其子进程，正在运行的任务随之中止"""
+    pid_queue = _discard_process_pool(pool)
+    if pid_queue is None:
+        return
+    # ProcessPoolExecutor 没有终止正在运行任务的公开接口（Python 3.14 之前），按子进程报告的 PID 结束它们；
+    # 任一子进程退出后进程池即判定为损坏，并自行终止其余尚未报告 PID 的子进程
+    while not pid_queue.empty():
+        with contextlib.suppress(OSError):
+            os.kill(pid_queue.get(), signal.SIGTERM)
+
+
 class BaseWorker(QThread):
     """基础工作线程类"""
     total_progress = Signal(int)
@@ -348,10 +473,135 @@ class BaseWorker(QThread):
     def __init__(self):
         super().__init__()
         self._is_running = True
+        # 停止时置位，正在运行的 Ghostscript 子进程据此被立即终止
+        self._cancel_event = threading.Event()
+        # 逐文件的总进度按节流频率发送，避免大批量任务时信号淹没界面线程；
+        # 信号的 emit 在构造时绑定一次，回调中不再重复解析 self.total_progress
+        emit_total_progress = self.total_progress.emit
+        last_percent = -1
+
+        def report_percent(current, total):
+            # 百分比取整后与上次相同则不再发送，减少跨线程排队的重复信号
+            nonlocal last_percent
+            percent = current * 100 // total
+            if percent != last_percent:
+                last_percent = percent
+                emit_total_progress(percent)
+
+        self._report_progress = throttle_progress(report_percent)
 
     def stop(self):
         """停止工作线程"""
         self._is_running = False
+        self._cancel_event.set()
+
+    def _run_files_in_parallel(self, files, process_file, max_workers=_MAX_PARALLEL_FILES):
+        """
+        并发处理多个文件，每个文件完成后立即发送 file_finished 信号。
+        适用于由外部进程（Ghostscript）完成的处理，子进程之间互不影响，可真正并行。
+
+        :param files: 待处理的任务列表（文件路径，或 (输入路径, 输出路径) 元组），按下标对应表格行
+        :param process_file: 处理单个任务的函数，参数为任务列表中的一项，返回结果字典；返回 None 表示已取消，不发送结果
+        :param max_workers: 最大并发数，为 1 时按顺序逐个处理
+        """
+        total_files = len(files)
+        if total_files == 0:
+            return
+
+        def run_one(job):
+            # 停止后尚未开始的文件直接跳过
+            if not self._is_running:
+                return None
+            return process_file(job)
+
+        completed = 0
+        with ThreadPoolExecutor(max_workers=min(total_files, max_workers)) as executor:
+            futures = {executor.submit(run_one, job): i for i, job in enumerate(files)}
+            for future in as_completed(futures):
+                result = future.result()
+                if result is not None:
+                    self.file_finished.emit(futures[future], result)
+                completed += 1
+                self._report_progress(completed, total_files)
+
+    def _run_files_in_processes(self, jobs, process_func, handle_result):
+        """
+        在共用进程池中并发处理多个文件，每个文件完成后立即发送 file_finished 信号。
+        适用于 PyMuPDF/pikepdf 这类不释放 GIL、也不支持多线程并发使用的处理。
+        只有一个文件时直接在当前线程处理，不启动子进程。
+        停止时终止正在运行的子进程，并删除这些文件未写完的输出。
+
+        :param jobs: 处理函数的参数元组列表，按下标对应表格行；每个元组的第二项为输出文件路径
+        :param process_func: 模块级处理函数（需可被 pickle），以 process_func(*job) 调用
+        :param handle_result: 在本线程中把处理函数的返回值转换为结果字典；返回 None 表示不发送结果
+        """
+        total_files = len(jobs)
+        if total_files == 0:
+            return
+
+        completed = 0
+
+        def emit_result(index, result):
+            nonlocal completed
+            if result is not None:
+                self.file_finished.emit(index, result)
+            completed += 1
+            self._report_progress(completed, total_files)
+
+        def finish(index, get_result):
+            try:
+                result = handle_result(get_result())
+            except BrokenProcessPool:
+                result = {"success": False, "message": "处理进程意外退出，文件未完成处理"}
+            except Exception as e:
+                result = {
+                    "success": False,
+                    "message": f"文件处理异常: {str(e)}"
+                }
+            emit_result(index, result)
+
+        if total_files == 1:
+            finish(0, lambda: process_func(*jobs[0]))
+            return
+
+        futures = None
+        for _ in range(2):
+            pool = _get_process_pool()
+            try:
+                futures = {pool.submit(process_func, *job): i for i, job in enumerate(jobs)}
+                break
+            except BrokenProcessPool:
+                # 进程池在之前的任务中已损坏（例如子进程被外部结束）：丢弃后用新建的进程池重试一次
+                _discard_process_pool(pool)
+        if futures is None:
+            for i in range(total_files):
+                emit_result(i, {"success": False, "message": "无法启动处理进程"})
+            return
+
+        pending = set(futures)
+        while pending:
+            # 定期醒来检查停止标志，不必等正在处理的大文件完成
+            done, pending = wait(pending, timeout=0.2, return_when=FIRST_COMPLETED)
+            for future in done:
+                if not future.cancelled() and isinstance(future.exception(), BrokenProcessPool):
+                    # 有子进程意外退出时进程池会终止全部子进程：丢弃它，下次使用时重新创建，
+                    # 未完成的文件各自报告失败并删除写了一半的输出
+                    _discard_process_pool(pool)
+                    remove_partial_output(jobs[futures[future]][1])
+                finish(futures[future], future.result)
+            if pending and self._cancel_event.is_set():
+                running = [jobs[futures[future]] for future in pending if future.running()]
+                _terminate_process_pool(pool)
+                for job in running:
+                    remove_partial_output(job[1])
+                return
+
+
+def _tagged_output_path(file_path, tag):
+    """在源文件名与扩展名之间插入标记，得到同目录下的输出文件路径"""
+    path = Path(file_path)
+    return str(path.with_name(f"{path.stem}{tag}{path.suffix}"))
+
 
 class OptimizeWorker(BaseWorker):
     """PDF优化工作线程"""
@@ -360,39 +610,59 @@ class OptimizeWorker(BaseWorker):
         self.files = files
         self.quality = quality
         self.engine = engine
+        # 引擎在整个批次中不变：处理函数和每个文件的输出路径在构造时一次算好
+        self.use_ghostscript = "Ghostscript" in engine
+        if self.use_ghostscript:
+            # Ghostscript 子进程可在停止时被中途终止
+            self._optimize_func = functools.partial(optimize_pdf_with_ghostscript, cancel_event=self._cancel_event)
+        else:
+            self._optimize_func = optimize_pdf
+        output_tag = f"[{engine.replace(' 引擎', '')}][已优化]"
+        self.jobs = [(file_path, _tagged_output_path(file_path, output_tag)) for file_path in files]
+    @staticmethod
+    def _build_result(result):
+        """把 core 返回的优化结果转换为表格所需的结果字典；已取消的任务返回 None"""
+        if result.get("cancelled"):
+            return None
+        if result.get("success"):
+            # 显示用的字符串在工作线程中格式化好，GUI 线程只负责填表
+            orig_size = result["original_size"] / (1024 * 1024)
+            opt_size = result["optimized_size"] / (1024 * 1024)
+            reduction = ((orig_size - opt_size) / orig_size) * 100 if orig_size > 0 else 0
+            return {
+                "success": True,
+                "original_size": result["original_size"],
+                "optimized_size": result["optimized_size"],
+                "original_size_str": f"{orig_size:.2f} MB",
+                "optimized_size_str": f"{opt_size:.2f} MB",
+                "reduction_str": f"{reduction:.1f}%"
+            }
+        return {
+            "success": False,
+            "message": result.get("message", "未知错误")
+        }
+
     def run(self):
-        total_files = len(self.files)
-        for i, file_path in enumerate(self.files):
-            if not self._is_running:
-                break
+        if not self.use_ghostscript:
+            # PyMuPDF 大部分操作不释放 GIL 且不支持多线程并发使用，改为在独立子进程中并行处理
+            jobs = [(file_path, output_path, self.quality) for file_path, output_path in self.jobs]
+            self._run_files_in_processes(jobs, self._optimize_func, self._build_result)
+            return
+
+        optimize_func = self._optimize_func
+
+        def optimize_file(job):
+            file_path, output_path = job
             try:
-                filename, ext = os.path.splitext(os.path.basename(file_path))
-                engine_name = self.engine.replace(" 引擎", "")
-                new_filename = f"{filename}[{engine_name}][已优化]{ext}"
-                output_path = os.path.join(os.path.dirname(file_path), new_filename)
-                
-                if "Ghostscript" in self.engine:
-                    result = optimize_pdf_with_ghostscript(file_path, output_path, self.quality)
-                else:
-                    result = optimize_pdf(file_path, output_path, self.quality)
-                if result.get("success"):
-                    self.file_finished.emit(i, {
-                        "success": True,
-                        "original_size": result["original_size"],
-                        "optimized_size": result["optimized_size"]
-                    })
-                else:
-                    self.file_finished.emit(i, {
-                        "success": False,
-                        "message": result.get("message", "未知错误")
-                    })
+                return self._build_result(optimize_func(file_path, output_path, self.quality))
             except Exception as e:
-                self.file_finished.emit(i, {
+                return {
                     "success": False,
                     "message": f"文件处理异常: {str(e)}"
-                })
-            progress = int((i + 1) / total_files * 100)
-            self.total_progress.emit(progress)
+                }
+
+        # Ghostscript 在外部进程中处理，线程池即可并行
+        self._run_files_in_parallel(self.jobs, optimize_file)
 class MergeWorker(BaseWorker):
     """PDF合并工作线程"""
     def __init__(self, files, output_path, engine):
@@ -400,12 +670,20 @@ class MergeWorker(BaseWorker):
         self.files = files
         self.output_path = output_path
         self.engine = engine
+        # 合并进度由 core 在工作线程中以百分比回调，复用基类的节流与去重后再跨线程发送，
+        # 达到 100% 时总会发送
+        report_progress = self._report_progress
+
+        def update_progress(value):
+            report_progress(int(value), 100)
+
+        self._update_progress = update_progress
     def run(self):
         try:
             if "Ghostscript" in self.engine:
-                result = merge_pdfs_with_ghostscript(self.files, self.output_path)
+                result = merge_pdfs_with_ghostscript(self.files, self.output_path, self._update_progress)
             else:
-                result = merge_pdfs(self.files, self.output_path)
+                result = merge_pdfs(self.files, self.output_path, self._update_progress)
             if result.get("success"):
                 self.file_finished.emit(0, {
                     "success": True,
@@ -421,40 +699,37 @@ class MergeWorker(BaseWorker):
                 "success": False,
                 "message": str(e)
             })
-        self.total_progress.emit(100)
+        self._update_progress(100)
 class CurvesWorker(BaseWorker):
     """PDF转曲工作线程"""
     def __init__(self, files):
         super().__init__()
         self.files = files
+        self.jobs = [(file_path, _tagged_output_path(file_path, "[Ghostscript][已转曲]")) for file_path in files]
     def run(self):
-        total_files = len(self.files)
-        for i, file_path in enumerate(self.files):
-            if not self._is_running:
-                break
+        def convert_file(job):
+            file_path, output_path = job
             try:
-                filename, ext = os.path.splitext(os.path.basename(file_path))
-                new_filename = f"{filename}[Ghostscript][已转曲]{ext}"
-                output_path = os.path.join(os.path.dirname(file_path), new_filename)
-                result = convert_to_curves_with_ghostscript(file_path, output_path)
+                result = convert_to_curves_with_ghostscript(file_path, output_path, cancel_event=self._cancel_event)
+                if result.get("cancelled"):
+                    return None
                 if result.get("success"):
-                    self.file_finished.emit(i, {
+                    return {
                         "success": True,
                         "original_size": result.get("original_size", 0),
                         "optimized_size": result.get("optimized_size", 0)
-                    })
-                else:
-                    self.file_finished.emit(i, {
-                        "success": False,
-                        "message": result.get("message", "未知错误")
-                    })
+                    }
+                return {
+                    "success": False,
+                    "message": result.get("message", "未知错误")
+                }
             except Exception as e:
-                self.file_finished.emit(i, {
+                return {
                     "success": False,
                     "message": str(e)
-                })
-            progress = int((i + 1) / total_files * 100)
-            self.total_progress.emit(progress)
+                }
+
+        self._run_files_in_parallel(self.jobs, convert_file)
 class PdfToImageWorker(BaseWorker):
     """PDF转图片工作线程"""
     progress_updated = Signal(int, int, int)  # file_index, current_page, total_pages
@@ -464,8 +739,11 @@ class PdfToImageWorker(BaseWorker):
         self.output_dir = output_dir
         self.image_format = image_format
         self.dpi = dpi
+        # 逐页进度回调在构造时预先绑定信号的 emit，避免每页重复解析 self.progress_updated
+        self._emit_page_progress = self.progress_updated.emit
     def run(self):
         total_files = len(self.files)
+        emit_page_progress = self._emit_page_progress
         for i, file_path in enumerate(self.files):
             if not self._is_running:
                 break
@@ -475,7 +753,7 @@ class PdfToImageWorker(BaseWorker):
                     self.output_dir,
                     self.image_format,
                     self.dpi,
-                    lambda current, total: self.progress_updated.emit(i, current, total)
+                    functools.partial(emit_page_progress, i)
                 )
                 
                 if result.get("success"):
@@ -493,8 +771,7 @@ class PdfToImageWorker(BaseWorker):
                     "success": False,
                     "message": str(e)
                 })
-            progress = int((i + 1) / total_files * 100)
-            self.total_progress.emit(progress)
+            self._report_progress(i + 1, total_files)
 class SplitWorker(BaseWorker):
     """PDF分割工作线程"""
     progress_updated = Signal(int, int, int)
@@ -502,8 +779,11 @@ class SplitWorker(BaseWorker):
         super().__init__()
         self.files = files
         self.output_dir = output_dir
+        # 逐页进度回调在构造时预先绑定信号的 emit，避免每页重复解析 self.progress_updated
+        self._emit_page_progress = self.progress_updated.emit
     def run(self):
         total_files = len(self.files)
+        emit_page_progress = self._emit_page_progress
         for i, file_path in enumerate(self.files):
             if not self._is_running:
                 break
@@ -511,7 +791,7 @@ class SplitWorker(BaseWorker):
                 result = split_pdf(
                     file_path,
                     self.output_dir,
-                    lambda current, total: self.progress_updated.emit(i, current, total)
+                    functools.partial(emit_page_progress, i)
                 )
                 if result.get("success"):
                     self.file_finished.emit(i, {
@@ -528,8 +808,7 @@ class SplitWorker(BaseWorker):
                     "success": False,
                     "message": str(e)
                 })
-            progress = int((i + 1) / total_files * 100)
-            self.total_progress.emit(progress)
+            self._report_progress(i + 1, total_files)
 class OcrWorker(QThread):
     """PDF OCR 工作线程"""
     ocr_progress = Signal(str)
@@ -803,10 +1082,48 @@ class OcrWorker(QThread):
             self.total_progress.emit(100)
 
 
+# “关于”对话框内容，构造主窗口时代入版本号格式化一次
+_ABOUT_HTML_TEMPLATE = """
+<div style='color:#1e293b;'>
+    <p style='font-size:14pt; font-weight:bold; text-align:center;'>PDF Optimizer</p>
+    <p style='font-size:10pt; text-align:center; color:#64748b;'>一个功能强大的PDF处理工具</p>
+    <hr style='border-color:#e2e8f0;'>
+    <p style='font-size:10pt;'><b>版本:</b> {version}</p>
+    <p style='font-size:10pt;'><b>作者:</b> WanderInDoor</p>
+    <p style='font-size:10pt;'><b>联系方式:</b> 76757488@qq.com</p>
+    <p style='font-size:10pt;'><b>源代码:</b> <a href="https://github.com/ourpurple/PDFOptimizer" style="color:#3b82f6;">https://github.com/ourpurple/PDFOptimizer</a></p>
+    <hr style='border-color:#e2e8f0;'>
+    <p style='font-size:10pt;'><b>主要功能:</b></p>
+    <ul style='font-size:9pt; color:#475569;'>
+        <li>PDF优化（压缩）</li>
+        <li>PDF合并与分割</li>
+        <li>PDF转图片</li>
+        <li>PDF转曲（字体轮廓化）</li>
+        <li>PDF书签管理</li>
+        <li>PDF OCR识别（支持AI模型）</li>
+    </ul>
+    <hr style='border-color:#e2e8f0;'>
+    <p style='font-size:8pt; color:#94a3b8;'>基于 PySide6, Pikepdf, PyMuPDF 和 Ghostscript 构建</p>
+</div>
+"""
+
+
 class MainWindow(QMainWindow):
     # UI 布局常量
-    RESULT_SPLITTER_RATIO = [400, 400]  # 结果和日志区域1:1比例
-    MAIN_SPLITTER_RATIO = [300, 700]    # 文件表格30%:结果区域70%
+    RESULT_SPLITTER_RATIO = (400, 400)  # 结果和日志区域1:1比例
+    MAIN_SPLITTER_RATIO = (300, 700)    # 文件表格30%:结果区域70%
+
+    # 后台线程完成 Ghostscript 检测后发出，结果在界面线程中处理
+    ghostscript_checked = Signal(bool)
+    pandoc_checked = Signal(bool)
+    # 后台扫描拖入文件夹时分批发回发现的文件：(标签页索引, 文件路径列表)
+    files_discovered = Signal(int, list)
+    # 扫描到的文件数达到上限而提前停止时发出：(上限)
+    folder_scan_truncated = Signal(int)
+    # 单次拖入文件夹最多收集的文件数，避免误拖入磁盘根目录等超大目录时长时间扫描并塞满表格
+    MAX_SCANNED_FILES = 5000
+    # 批量任务失败汇总提示框中最多列出的失败信息条数，其余可在表格状态列的提示中查看
+    MAX_LISTED_ERRORS = 10
     
     def _is_image_file(self, file_path):
         """检查文件是否为支持的图片格式"""
@@ -815,12 +1132,33 @@ class MainWindow(QMainWindow):
     
     def __init__(self):
         super().__init__()
+        # 在 check_ghostscript() 检测之前先给出确定的默认值，构建界面期间的回调可直接读取
+        self.gs_installed = False
+        self.pandoc_installed = False
+        # _update_controls_state 上次应用的状态，None 表示尚未应用
+        self._last_controls_state = None
+        # 优化结果先暂存，由单次定时器每 50ms 合并写入表格，避免大量小文件快速完成时逐个刷新
+        self._pending_optimize_results = []
+        # 本批次的失败信息，任务结束后汇总为一个提示框，不在刷新时逐个弹出模态框
+        self._optimize_errors = []
+        self._optimize_flush_timer = QTimer(self)
+        self._optimize_flush_timer.setSingleShot(True)
+        self._optimize_flush_timer.setInterval(50)
+        self._optimize_flush_timer.timeout.connect(self._flush_optimize_results)
+        # 转曲由多个 Ghostscript 进程并行完成，结果同样暂存后合并写入
+        self._pending_curves_results = []
+        self._curves_errors = []
+        self._curves_flush_timer = QTimer(self)
+        self._curves_flush_timer.setSingleShot(True)
+        self._curves_flush_timer.setInterval(50)
+        self._curves_flush_timer.timeout.connect(self._flush_curves_results)
         self.app_version = f"v{__version__}"
+        self._about_html = _ABOUT_HTML_TEMPLATE.format(version=self.app_version)
         self.setWindowTitle(f"PDF Optimizer - {self.app_version}")
         self.setGeometry(100, 100, 1080, 720)
-        icon_path = resource_path("ui/app.ico")
-        if os.path.exists(icon_path):
-            self.setWindowIcon(QIcon(icon_path))
+        icon = app_icon()
+        if icon is not None:
+            self.setWindowIcon(icon)
         self.setAcceptDrops(True)
         main_layout = QVBoxLayout()
         self.tab_widget = QTabWidget()
@@ -873,14 +1211,17 @@ class MainWindow(QMainWindow):
         central_widget.setLayout(main_layout)
         self.setCentralWidget(central_widget)
         self.apply_stylesheet()
+        self.ghostscript_checked.connect(self._on_ghostscript_checked)
+        self.pandoc_checked.connect(self._on_pandoc_checked)
+        self.files_discovered.connect(self._on_files_discovered)
+        self.folder_scan_truncated.connect(self._on_folder_scan_truncated)
         self.check_ghostscript()
         self.check_pandoc()
         self._load_config()
         self._update_controls_state()
         
         self.temp_dir = os.path.join(os.path.expanduser("~"), ".pdfoptimizer", "temp")
-        if not os.path.exists(self.temp_dir):
-            os.makedirs(self.temp_dir)
+        os.makedirs(self.temp_dir, exist_ok=True)
         qr = self.frameGeometry()
         cp = self.screen().availableGeometry().center()
         qr.moveCenter(cp)
@@ -914,28 +1255,33 @@ class MainWindow(QMainWindow):
                 self.add_files_to_ocr(files)
     def _reset_optimize_ui(self):
         self.progress_bar.setValue(0)
-        for row in range(self.file_table.rowCount()):
-            self.file_table.setItem(row, 2, QTableWidgetItem("-"))
-            self.file_table.setItem(row, 3, QTableWidgetItem("-"))
-            self.file_table.setItem(row, 4, QTableWidgetItem("排队中..."))
+        with batched_table_update(self.file_table):
+            for row in range(self.file_table.rowCount()):
+                self.file_table.set_cell_text(row, 2, "-")
+                self.file_table.set_cell_text(row, 3, "-")
+                self.file_table.set_cell_text(row, 4, "排队中...")
     
     def _reset_curves_ui(self):
         self.curves_progress_bar.setValue(0)
-        for row in range(self.curves_table.rowCount()):
-            self.curves_table.setItem(row, 2, QTableWidgetItem("排队中..."))
+        with batched_table_update(self.curves_table):
+            for row in range(self.curves_table.rowCount()):
+                self.curves_table.set_cell_text(row, 2, "排队中...")
     def _reset_pdf_to_image_ui(self):
         self.pdf_to_image_progress_bar.setValue(0)
-        for row in range(self.pdf_to_image_table.rowCount()):
-            self.pdf_to_image_table.setItem(row, 1, QTableWidgetItem("排队中..."))
+        with batched_table_update(self.pdf_to_image_table):
+            for row in range(self.pdf_to_image_table.rowCount()):
+                self.pdf_to_image_table.set_cell_text(row, 1, "排队中...")
     def _reset_split_ui(self):
         self.split_progress_bar.setValue(0)
-        for row in range(self.split_table.rowCount()):
-            self.split_table.setItem(row, 1, QTableWidgetItem("排队中..."))
+        with batched_table_update(self.split_table):
+            for row in range(self.split_table.rowCount()):
+                self.split_table.set_cell_text(row, 1, "排队中...")
     def _reset_bookmark_ui(self):
         self.bookmark_progress_bar.setValue(0)
-        for row in range(self.bookmark_file_table.rowCount()):
-            self.bookmark_file_table.setItem(row, 1, QTableWidgetItem("排队中..."))
-            self.bookmark_file_table.setItem(row, 2, QTableWidgetItem("操作"))
+        with batched_table_update(self.bookmark_file_table):
+            for row in range(self.bookmark_file_table.rowCount()):
+                self.bookmark_file_table.set_cell_text(row, 1, "排队中...")
+                self.bookmark_file_table.set_cell_text(row, 2, "操作")
     def _append_log_with_scroll(self, html_message):
         """添加HTML格式的日志消息并自动滚动到底部"""
         self.ocr_log_text.append(html_message)
@@ -972,7 +1318,7 @@ class MainWindow(QMainWindow):
         self.ocr_result_text.clear()
         self.ocr_log_text.clear()  # 清空日志显示区域
         if self.ocr_table.rowCount() > 0:
-            self.ocr_table.setItem(0, 1, QTableWidgetItem("排队中..."))
+            self.ocr_table.set_cell_text(0, 1, "排队中...")
  
     def _update_empty_state_hints(self):
         """根据各表格的行数切换空状态提示和表格的显示"""
@@ -991,6 +1337,21 @@ class MainWindow(QMainWindow):
                 stack.setCurrentIndex(1 if table.rowCount() > 0 else 0)
 
     def _update_controls_state(self, is_task_running=False):
+        # 控件状态只取决于以下几项，与上次相同时跳过全部 setEnabled 调用
+        state = (
+            is_task_running,
+            self.gs_installed,
+            self.file_table.rowCount() > 0,
+            self.merge_table.rowCount() > 0,
+            self.curves_table.rowCount() > 0,
+            self.pdf_to_image_table.rowCount() > 0,
+            self.split_table.rowCount() > 0,
+            self.bookmark_file_table.rowCount() > 0,
+            self.ocr_table.rowCount() > 0,
+        )
+        if state == self._last_controls_state:
+            return
+        self._last_controls_state = state
         enable_when_not_running = not is_task_running
         
         optimize_files_exist = self.file_table.rowCount() > 0
@@ -1047,8 +1408,8 @@ class MainWindow(QMainWindow):
             return
         self._reset_optimize_ui()
         self._update_controls_state(is_task_running=True)
-        files = [self.file_table.item(i, 0).data(Qt.ItemDataRole.UserRole) 
-                for i in range(self.file_table.rowCount())]
+        self._optimize_errors = []
+        files = self.file_table.file_paths()
         quality = self.quality_combo.currentText()
         engine = self.engine_combo.currentText()
         self.optimize_worker = OptimizeWorker(files, quality, engine)
@@ -1063,7 +1424,8 @@ class MainWindow(QMainWindow):
             return
         self._reset_curves_ui()
         self._update_controls_state(is_task_running=True)
-        files = [self.curves_table.item(i, 0).data(Qt.ItemDataRole.UserRole) for i in range(self.curves_table.rowCount())]
+        self._curves_errors = []
+        files = self.curves_table.file_paths()
         self.curves_worker = CurvesWorker(files)
         self.curves_worker.total_progress.connect(self.curves_progress_bar.setAnimatedValue)
         self.curves_worker.file_finished.connect(self.on_curves_file_finished)
@@ -1079,7 +1441,7 @@ class MainWindow(QMainWindow):
             return
         self._reset_pdf_to_image_ui()
         self._update_controls_state(is_task_running=True)
-        files = [self.pdf_to_image_table.item(i, 0).data(Qt.ItemDataRole.UserRole) for i in range(self.pdf_to_image_table.rowCount())]
+        files = self.pdf_to_image_table.file_paths()
         image_format = self.image_format_combo.currentText().lower()
         dpi = int(self.dpi_combo.currentText())
         self.pdf_to_image_worker = PdfToImageWorker(files, output_dir, image_format, dpi)
@@ -1098,7 +1460,7 @@ class MainWindow(QMainWindow):
             return
         self._reset_split_ui()
         self._update_controls_state(is_task_running=True)
-        files = [self.split_table.item(i, 0).data(Qt.ItemDataRole.UserRole) for i in range(self.split_table.rowCount())]
+        files = self.split_table.file_paths()
         self.split_worker = SplitWorker(files, output_dir)
         self.split_worker.total_progress.connect(self.split_progress_bar.setAnimatedValue)
         self.split_worker.progress_updated.connect(self.on_split_progress)
@@ -1107,66 +1469,102 @@ class MainWindow(QMainWindow):
         self.split_worker.start()
         self.status_label.setText("正在分割PDF文件...")
     def on_optimize_file_finished(self, row, result):
-        if result.get("success"):
-            orig_size = result["original_size"] / (1024 * 1024)
-            opt_size = result["optimized_size"] / (1024 * 1024)
-            reduction = ((orig_size - opt_size) / orig_size) * 100 if orig_size > 0 else 0
-            self.file_table.setItem(row, 1, QTableWidgetItem(f"{orig_size:.2f} MB"))
-            self.file_table.setItem(row, 2, QTableWidgetItem(f"{opt_size:.2f} MB"))
-            self.file_table.setItem(row, 3, QTableWidgetItem(f"{reduction:.1f}%"))
-            self.file_table.setItem(row, 4, QTableWidgetItem("优化成功"))
-        else:
-            self.file_table.setItem(row, 4, QTableWidgetItem("优化失败"))
-            error_message = result.get("message", "未知错误")
-            self.file_table.item(row, 4).setToolTip(error_message)
-            CustomMessageBox.warning(self, "优化失败", f"文件处理失败：\n{error_message}")
+        self._pending_optimize_results.append((row, result))
+        if not self._optimize_flush_timer.isActive():
+            self._optimize_flush_timer.start()
+
+    def _flush_optimize_results(self):
+        """把暂存的优化结果一次性写入表格，失败信息留到任务结束后汇总提示"""
+        self._optimize_flush_timer.stop()
+        pending, self._pending_optimize_results = self._pending_optimize_results, []
+        if not pending:
+            return
+        with batched_table_update(self.file_table):
+            for row, result in pending:
+                if result.get("success"):
+                    self.file_table.set_cell_text(row, 1, result["original_size_str"])
+                    self.file_table.set_cell_text(row, 2, result["optimized_size_str"])
+                    self.file_table.set_cell_text(row, 3, result["reduction_str"])
+                    self.file_table.set_cell_text(row, 4, "优化成功").setToolTip("")
+                else:
+                    error_message = result.get("message", "未知错误")
+                    self.file_table.set_cell_text(row, 4, "优化失败").setToolTip(error_message)
+                    self._optimize_errors.append(error_message)
             
     def on_curves_file_finished(self, row, result):
-        if result.get("success"):
-            self.curves_table.setItem(row, 2, QTableWidgetItem("转曲成功"))
+        self._pending_curves_results.append((row, result))
+        if not self._curves_flush_timer.isActive():
+            self._curves_flush_timer.start()
+
+    def _flush_curves_results(self):
+        """把暂存的转曲结果一次性写入表格，失败信息留到任务结束后汇总提示"""
+        self._curves_flush_timer.stop()
+        pending, self._pending_curves_results = self._pending_curves_results, []
+        if not pending:
+            return
+        with batched_table_update(self.curves_table):
+            for row, result in pending:
+                if result.get("success"):
+                    self.curves_table.set_cell_text(row, 2, "转曲成功").setToolTip("")
+                else:
+                    error_message = result.get("message", "未知错误")
+                    self.curves_table.set_cell_text(row, 2, "转曲失败").setToolTip(error_message)
+                    self._curves_errors.append(error_message)
+
+    def _show_failure_summary(self, title, error_messages):
+        """批量任务结束后用一个提示框汇总全部失败信息"""
+        if not error_messages:
+            return
+        if len(error_messages) == 1:
+            text = f"文件处理失败：\n{error_messages[0]}"
         else:
-            self.curves_table.setItem(row, 2, QTableWidgetItem("转曲失败"))
-            error_message = result.get("message", "未知错误")
-            self.curves_table.item(row, 2).setToolTip(error_message)
-            CustomMessageBox.warning(self, "转曲失败", f"文件处理失败：\n{error_message}")
+            listed = "\n".join(error_messages[:self.MAX_LISTED_ERRORS])
+            text = f"{len(error_messages)} 个文件处理失败：\n{listed}"
+            if len(error_messages) > self.MAX_LISTED_ERRORS:
+                text += f"\n……其余 {len(error_messages) - self.MAX_LISTED_ERRORS} 个失败信息见表格状态列的提示"
+        CustomMessageBox.warning(self, title, text)
     def on_pdf_to_image_file_finished(self, row, result):
         if result.get("success"):
-            self.pdf_to_image_table.setItem(row, 1, QTableWidgetItem("转换成功"))
-            self.pdf_to_image_table.item(row, 1).setToolTip(result.get("message"))
+            self.pdf_to_image_table.set_cell_text(row, 1, "转换成功").setToolTip(result.get("message"))
         else:
-            self.pdf_to_image_table.setItem(row, 1, QTableWidgetItem("转换失败"))
             error_message = result.get("message", "未知错误")
-            self.pdf_to_image_table.item(row, 1).setToolTip(error_message)
+            self.pdf_to_image_table.set_cell_text(row, 1, "转换失败").setToolTip(error_message)
             CustomMessageBox.warning(self, "转换失败", f"文件处理失败：\n{error_message}")
     def on_pdf_to_image_progress(self, file_index, current_page, total_pages):
         if total_pages > 0:
             progress_percentage = int((current_page / total_pages) * 100)
-            self.pdf_to_image_table.setItem(file_index, 1, QTableWidgetItem(f"转换中... {progress_percentage}%"))
+            self.pdf_to_image_table.set_cell_text(file_index, 1, f"转换中... {progress_percentage}%")
     def on_split_file_finished(self, row, result):
         if result.get("success"):
-            self.split_table.setItem(row, 1, QTableWidgetItem("分割成功"))
-            self.split_table.item(row, 1).setToolTip(result.get("message"))
+            self.split_table.set_cell_text(row, 1, "分割成功").setToolTip(result.get("message"))
         else:
-            self.split_table.setItem(row, 1, QTableWidgetItem("分割失败"))
             error_message = result.get("message", "未知错误")
-            self.split_table.item(row, 1).setToolTip(error_message)
+            self.split_table.set_cell_text(row, 1, "分割失败").setToolTip(error_message)
             CustomMessageBox.warning(self, "分割失败", f"文件处理失败：\n{error_message}")
     def on_split_progress(self, file_index, current_page, total_pages):
         if total_pages > 0:
             progress_percentage = int((current_page / total_pages) * 100)
-            self.split_table.setItem(file_index, 1, QTableWidgetItem(f"分割中... {progress_percentage}%"))
+            self.split_table.set_cell_text(file_index, 1, f"分割中... {progress_percentage}%")
     def on_optimize_all_finished(self):
+        # 先写入尚未刷新的结果，再更新完成状态
+        self._flush_optimize_results()
         self.status_label.setText("PDF优化完成！")
         self.progress_bar.setValue(100)
         self._update_controls_state()
+        error_messages, self._optimize_errors = self._optimize_errors, []
+        self._show_failure_summary("优化失败", error_messages)
     def on_merge_all_finished(self):
         self.status_label.setText("PDF合并完成！")
         self.merge_progress_bar.setValue(100)
         self._update_controls_state()
     def on_curves_all_finished(self):
+        # 先写入尚未刷新的结果，再更新完成状态
+        self._flush_curves_results()
         self.status_label.setText("PDF转曲完成！")
         self.curves_progress_bar.setValue(100)
         self._update_controls_state()
+        error_messages, self._curves_errors = self._curves_errors, []
+        self._show_failure_summary("转曲失败", error_messages)
     def on_pdf_to_image_all_finished(self):
         self.status_label.setText("PDF转图片完成！")
         self.pdf_to_image_progress_bar.setValue(100)
@@ -1208,42 +1606,17 @@ class MainWindow(QMainWindow):
             self.status_label.setText("请选择要进行OCR识别的PDF文件...")
         self._update_controls_state()
     def show_about_dialog(self):
-        about_text = f"""
-<div style='color:#1e293b;'>
-    <p style='font-size:14pt; font-weight:bold; text-align:center;'>PDF Optimizer</p>
-    <p style='font-size:10pt; text-align:center; color:#64748b;'>一个功能强大的PDF处理工具</p>
-    <hr style='border-color:#e2e8f0;'>
-    <p style='font-size:10pt;'><b>版本:</b> {self.app_version}</p>
-    <p style='font-size:10pt;'><b>作者:</b> WanderInDoor</p>
-    <p style='font-size:10pt;'><b>联系方式:</b> 76757488@qq.com</p>
-    <p style='font-size:10pt;'><b>源代码:</b> <a href="https://github.com/ourpurple/PDFOptimizer" style="color:#3b82f6;">https://github.com/ourpurple/PDFOptimizer</a></p>
-    <hr style='border-color:#e2e8f0;'>
-    <p style='font-size:10pt;'><b>主要功能:</b></p>
-    <ul style='font-size:9pt; color:#475569;'>
-        <li>PDF优化（压缩）</li>
-        <li>PDF合并与分割</li>
-        <li>PDF转图片</li>
-        <li>PDF转曲（字体轮廓化）</li>
-        <li>PDF书签管理</li>
-        <li>PDF OCR识别（支持AI模型）</li>
-    </ul>
-    <hr style='border-color:#e2e8f0;'>
-    <p style='font-size:8pt; color:#94a3b8;'>基于 PySide6, Pikepdf, PyMuPDF 和 Ghostscript 构建</p>
-</div>
-"""
-        CustomMessageBox.about(self, "关于 PDF Optimizer", about_text)
+        CustomMessageBox.about(self, "关于 PDF Optimizer", self._about_html)
 
     def apply_stylesheet(self):
-        style_path = resource_path("ui/style.qss")
-        if os.path.exists(style_path):
-            with open(style_path, "r", encoding="utf-8") as f:
-                qss = f.read()
-            # 将QSS中的相对路径替换为绝对路径，确保图标资源能正确加载
-            base_dir = resource_path("").replace("\\", "/")
-            if not base_dir.endswith("/"):
-                base_dir += "/"
-            qss = qss.replace("url(ui/", f"url({base_dir}ui/")
-            self.setStyleSheet(qss)
+        qss = _load_qss(resource_path("ui/style.qss"))
+        if qss:
+            # 设置样式表期间暂停重绘，所有控件重新 polish 后统一刷新一次
+            self.setUpdatesEnabled(False)
+            try:
+                self.setStyleSheet(qss)
+            finally:
+                self.setUpdatesEnabled(True)
                 
     def show_config_manager_dialog(self):
         """显示配置管理对话框"""
@@ -1253,7 +1626,16 @@ class MainWindow(QMainWindow):
         dialog.exec()
 
     def check_ghostscript(self):
-        self.gs_installed = is_ghostscript_installed()
+        """在全局线程池中检测 Ghostscript，查找 PATH 期间不阻塞窗口显示"""
+        self.gs_status_label.setText("⏳ 正在检测 Ghostscript...")
+        self.gs_status_label.setStyleSheet("")
+        QThreadPool.globalInstance().start(
+            lambda: self.ghostscript_checked.emit(is_ghostscript_installed())
+        )
+
+    def _on_ghostscript_checked(self, installed):
+        """Ghostscript 检测完成回调"""
+        self.gs_installed = installed
         if self.gs_installed:
             self.gs_status_label.setText("✅ Ghostscript 已安装")
             self.gs_status_label.setStyleSheet("color: green;")
@@ -1265,10 +1647,21 @@ class MainWindow(QMainWindow):
         else:
             self.gs_status_label.setText("❌ 未找到 Ghostscript (转曲和GS优化不可用)")
             self.gs_status_label.setStyleSheet("color: red;")
+        # gs_installed 属于控件状态的一部分（转曲按钮依赖它），检测可能在任务运行中完成，沿用当前的运行状态
+        last_state = self._last_controls_state
+        self._update_controls_state(is_task_running=bool(last_state and last_state[0]))
 
     def check_pandoc(self):
-        """检查 pandoc 是否已安装，并更新状态标签。"""
-        self.pandoc_installed = is_pandoc_installed()
+        """在全局线程池中检查 pandoc 是否已安装，完成后更新状态标签。"""
+        self.pandoc_status_label.setText("⏳ 正在检测 Pandoc...")
+        self.pandoc_status_label.setStyleSheet("")
+        QThreadPool.globalInstance().start(
+            lambda: self.pandoc_checked.emit(is_pandoc_installed())
+        )
+
+    def _on_pandoc_checked(self, installed):
+        """Pandoc 检测完成回调"""
+        self.pandoc_installed = installed
         if self.pandoc_installed:
             self.pandoc_status_label.setText("✅ Pandoc 已安装")
             self.pandoc_status_label.setStyleSheet("color: green;")
@@ -1281,59 +1674,157 @@ class MainWindow(QMainWindow):
             event.accept()
         else:
             event.ignore()
+    def _accepts_file(self, tab, file_path):
+        """OCR标签页支持PDF和图片文件，其他标签页只支持PDF文件"""
+        if file_path.lower().endswith('.pdf'):
+            return True
+        return tab == 6 and self._is_image_file(file_path)
+
     def dropEvent(self, event):
         files = []
+        folders = []
         current_tab = self.tab_widget.currentIndex()
         
         for url in event.mimeData().urls():
             file_path = url.toLocalFile()
-            
-            # OCR标签页支持PDF和图片文件
-            if current_tab == 6:  # OCR tab
-                if (file_path.lower().endswith('.pdf') or 
-                    self._is_image_file(file_path)):
-                    files.append(file_path)
-            else:
-                # 其他标签页只支持PDF文件
-                if file_path.lower().endswith('.pdf'):
-                    files.append(file_path)
+            if os.path.isdir(file_path):
+                folders.append(file_path)
+            elif self._accepts_file(current_tab, file_path):
+                files.append(file_path)
         
         if files:
-            if current_tab == 0:
-                self.add_files_to_optimize(files)
-            elif current_tab == 1:
-                self.add_files_to_merge(files)
-            elif current_tab == 2:
-                self.add_files_to_curves(files)
-            elif current_tab == 3:
-                self.add_files_to_pdf_to_image(files)
-            elif current_tab == 4:
-                self.add_files_to_split(files)
-            elif current_tab == 5: # 书签标签页
-                self.add_files_to_bookmark(files)
-            elif current_tab == 6:
-                self.add_files_to_ocr(files)
+            self._add_files_to_tab(current_tab, files)
+        if folders:
+            if current_tab == 2 and not self.gs_installed:
+                # 转曲功能不可用时无需扫描，直接给出提示
+                self.add_files_to_curves([])
+                return
+            self.status_label.setText("正在扫描拖入的文件夹...")
+            QThreadPool.globalInstance().start(
+                lambda: self._scan_folders(current_tab, folders)
+            )
+
+    @staticmethod
+    def _path_key(path):
+        """用于判断两个路径是否指向同一文件的规范化键"""
+        return os.path.normcase(os.path.abspath(path))
+
+    def _scan_folders(self, tab, folders, batch_size=200):
+        """
+        在线程池中用 os.scandir 递归遍历文件夹，按批通过 files_discovered 信号发回界面线程。
+        不进入符号链接目录（包括拖入的顶层文件夹），同一目录只扫描一次；
+        收集到 MAX_SCANNED_FILES 个文件后停止并发出 folder_scan_truncated。
+        """
+        logger = logging.getLogger(__name__)
+        batch = []
+        found = 0
+        visited = set()
+        pending = []
+        for folder in folders:
+            if os.path.islink(folder):
+                logger.warning("跳过符号链接文件夹: %s", folder)
+                continue
+            pending.append(os.path.abspath(folder))
+        pending.reverse()  # 按拖入顺序扫描
+        while pending:
+            folder = pending.pop()
+            key = self._path_key(folder)
+            if key in visited:
+                continue
+            visited.add(key)
+            try:
+                with os.scandir(folder) as it:
+                    entries = sorted(it, key=lambda entry: entry.name.lower())
+            except OSError as e:
+                logger.warning("扫描文件夹失败: %s", e)
+                continue
+            subfolders = []
+            for entry in entries:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        subfolders.append(entry.path)
+                    elif entry.is_file() and self._accepts_file(tab, entry.path):
+                        batch.append(entry.path)
+                        found += 1
+                except OSError:
+                    continue
+                if found >= self.MAX_SCANNED_FILES:
+                    if batch:
+                        self.files_discovered.emit(tab, batch)
+                    self.folder_scan_truncated.emit(self.MAX_SCANNED_FILES)
+                    return
+                if len(batch) >= batch_size:
+                    self.files_discovered.emit(tab, batch)
+                    batch = []
+            pending.extend(reversed(subfolders))
+        if batch:
+            self.files_discovered.emit(tab, batch)
+
+    def _on_files_discovered(self, tab, files):
+        """文件夹扫描结果：跳过目标表格中已有的文件后再添加"""
+        table = self._tab_tables()[tab]
+        existing = {self._path_key(path) for path in table.file_paths() if path}
+        new_files = []
+        for file_path in files:
+            key = self._path_key(file_path)
+            if key not in existing:
+                existing.add(key)
+                new_files.append(file_path)
+        if new_files:
+            self._add_files_to_tab(tab, new_files)
+
+    def _on_folder_scan_truncated(self, limit):
+        CustomMessageBox.warning(
+            self, "提示", f"拖入的文件夹中文件过多，只添加了前 {limit} 个文件。"
+        )
+
+    def _tab_tables(self):
+        """按标签页索引排列的文件表格"""
+        return (
+            self.file_table, self.merge_table, self.curves_table, self.pdf_to_image_table,
+            self.split_table, self.bookmark_file_table, self.ocr_table,
+        )
+
+    def _add_files_to_tab(self, tab, files):
+        if tab == 0:
+            self.add_files_to_optimize(files)
+        elif tab == 1:
+            self.add_files_to_merge(files)
+        elif tab == 2:
+            self.add_files_to_curves(files)
+        elif tab == 3:
+            self.add_files_to_pdf_to_image(files)
+        elif tab == 4:
+            self.add_files_to_split(files)
+        elif tab == 5: # 书签标签页
+            self.add_files_to_bookmark(files)
+        elif tab == 6:
+            self.add_files_to_ocr(files)
     def add_files_to_optimize(self, files):
         current_row = self.file_table.rowCount()
         self.file_table.setRowCount(current_row + len(files))
-        for i, file_path in enumerate(files):
-            row = current_row + i
-            self.file_table.setItem(row, 0, QTableWidgetItem(os.path.basename(file_path)))
-            self.file_table.setItem(row, 1, QTableWidgetItem("-"))
-            self.file_table.setItem(row, 2, QTableWidgetItem("-"))
-            self.file_table.setItem(row, 3, QTableWidgetItem("-"))
-            self.file_table.setItem(row, 4, QTableWidgetItem("等待中..."))
-            self.file_table.item(row, 0).setData(Qt.ItemDataRole.UserRole, file_path)
+        with batched_table_update(self.file_table):
+            for i, file_path in enumerate(files):
+                row = current_row + i
+                name_item = QTableWidgetItem(os.path.basename(file_path))
+                name_item.setData(Qt.ItemDataRole.UserRole, file_path)
+                self.file_table.setItem(row, 0, name_item)
+                self.file_table.setItem(row, 1, QTableWidgetItem("-"))
+                self.file_table.setItem(row, 2, QTableWidgetItem("-"))
+                self.file_table.setItem(row, 3, QTableWidgetItem("-"))
+                self.file_table.setItem(row, 4, QTableWidgetItem("等待中..."))
         self.status_label.setText(f"已添加 {len(files)} 个文件到优化列表。")
         self._update_controls_state()
     def add_files_to_merge(self, files):
         current_row = self.merge_table.rowCount()
         self.merge_table.setRowCount(current_row + len(files))
-        for i, file_path in enumerate(files):
-            row = current_row + i
-            self.merge_table.setItem(row, 0, QTableWidgetItem(os.path.basename(file_path)))
-            self.merge_table.setItem(row, 1, QTableWidgetItem("等待中..."))
-            self.merge_table.item(row, 0).setData(Qt.ItemDataRole.UserRole, file_path)
+        with batched_table_update(self.merge_table):
+            for i, file_path in enumerate(files):
+                row = current_row + i
+                name_item = QTableWidgetItem(os.path.basename(file_path))
+                name_item.setData(Qt.ItemDataRole.UserRole, file_path)
+                self.merge_table.setItem(row, 0, name_item)
+                self.merge_table.setItem(row, 1, QTableWidgetItem("等待中..."))
         self.status_label.setText(f"已添加 {len(files)} 个文件到合并列表。")
         self._update_controls_state()
     def add_files_to_curves(self, files):
@@ -1342,34 +1833,40 @@ class MainWindow(QMainWindow):
             return
         current_row = self.curves_table.rowCount()
         self.curves_table.setRowCount(current_row + len(files))
-        for i, file_path in enumerate(files):
-            row = current_row + i
-            size = os.path.getsize(file_path) / (1024 * 1024)
-            self.curves_table.setItem(row, 0, QTableWidgetItem(os.path.basename(file_path)))
-            self.curves_table.setItem(row, 1, QTableWidgetItem(f"{size:.2f} MB"))
-            self.curves_table.setItem(row, 2, QTableWidgetItem("等待中..."))
-            self.curves_table.item(row, 0).setData(Qt.ItemDataRole.UserRole, file_path)
+        with batched_table_update(self.curves_table):
+            for i, file_path in enumerate(files):
+                row = current_row + i
+                size = os.path.getsize(file_path) / (1024 * 1024)
+                name_item = QTableWidgetItem(os.path.basename(file_path))
+                name_item.setData(Qt.ItemDataRole.UserRole, file_path)
+                self.curves_table.setItem(row, 0, name_item)
+                self.curves_table.setItem(row, 1, QTableWidgetItem(f"{size:.2f} MB"))
+                self.curves_table.setItem(row, 2, QTableWidgetItem("等待中..."))
         self.status_label.setText(f"已添加 {len(files)} 个文件到转曲列表。")
         self._update_controls_state()
     def add_files_to_pdf_to_image(self, files):
         current_row = self.pdf_to_image_table.rowCount()
         self.pdf_to_image_table.setRowCount(current_row + len(files))
-        for i, file_path in enumerate(files):
-            row = current_row + i
-            self.pdf_to_image_table.setItem(row, 0, QTableWidgetItem(os.path.basename(file_path)))
-            self.pdf_to_image_table.setItem(row, 1, QTableWidgetItem("等待中..."))
-            self.pdf_to_image_table.item(row, 0).setData(Qt.ItemDataRole.UserRole, file_path)
+        with batched_table_update(self.pdf_to_image_table):
+            for i, file_path in enumerate(files):
+                row = current_row + i
+                name_item = QTableWidgetItem(os.path.basename(file_path))
+                name_item.setData(Qt.ItemDataRole.UserRole, file_path)
+                self.pdf_to_image_table.setItem(row, 0, name_item)
+                self.pdf_to_image_table.setItem(row, 1, QTableWidgetItem("等待中..."))
         
         self.status_label.setText(f"已添加 {len(files)} 个文件到转换列表。")
         self._update_controls_state()
     def add_files_to_split(self, files):
         current_row = self.split_table.rowCount()
         self.split_table.setRowCount(current_row + len(files))
-        for i, file_path in enumerate(files):
-            row = current_row + i
-            self.split_table.setItem(row, 0, QTableWidgetItem(os.path.basename(file_path)))
-            self.split_table.setItem(row, 1, QTableWidgetItem("等待中..."))
-            self.split_table.item(row, 0).setData(Qt.ItemDataRole.UserRole, file_path)
+        with batched_table_update(self.split_table):
+            for i, file_path in enumerate(files):
+                row = current_row + i
+                name_item = QTableWidgetItem(os.path.basename(file_path))
+                name_item.setData(Qt.ItemDataRole.UserRole, file_path)
+                self.split_table.setItem(row, 0, name_item)
+                self.split_table.setItem(row, 1, QTableWidgetItem("等待中..."))
         
         self.status_label.setText(f"已添加 {len(files)} 个文件到分割列表。")
         self._update_controls_state()
@@ -1377,18 +1874,20 @@ class MainWindow(QMainWindow):
         current_row = self.bookmark_file_table.rowCount()
         self.bookmark_file_table.setRowCount(current_row + len(files))
         use_common = self.use_common_bookmarks_checkbox.isChecked()
-        for i, file_path in enumerate(files):
-            row = current_row + i
-            self.bookmark_file_table.setItem(row, 0, QTableWidgetItem(os.path.basename(file_path)))
-            # 显示已有的书签数量
-            bookmark_count = 0
-            if use_common and hasattr(self, '_common_bookmarks'):
-                bookmark_count = len(self._common_bookmarks)
-            elif hasattr(self, '_file_bookmarks') and file_path in self._file_bookmarks:
-                bookmark_count = len(self._file_bookmarks[file_path])
-            self.bookmark_file_table.setItem(row, 1, QTableWidgetItem(str(bookmark_count) if bookmark_count > 0 else "未设置"))
-            self.bookmark_file_table.setItem(row, 2, QTableWidgetItem("操作"))
-            self.bookmark_file_table.item(row, 0).setData(Qt.ItemDataRole.UserRole, file_path)
+        with batched_table_update(self.bookmark_file_table):
+            for i, file_path in enumerate(files):
+                row = current_row + i
+                name_item = QTableWidgetItem(os.path.basename(file_path))
+                name_item.setData(Qt.ItemDataRole.UserRole, file_path)
+                self.bookmark_file_table.setItem(row, 0, name_item)
+                # 显示已有的书签数量
+                bookmark_count = 0
+                if use_common and hasattr(self, '_common_bookmarks'):
+                    bookmark_count = len(self._common_bookmarks)
+                elif hasattr(self, '_file_bookmarks') and file_path in self._file_bookmarks:
+                    bookmark_count = len(self._file_bookmarks[file_path])
+                self.bookmark_file_table.setItem(row, 1, QTableWidgetItem(str(bookmark_count) if bookmark_count > 0 else "未设置"))
+                self.bookmark_file_table.setItem(row, 2, QTableWidgetItem("操作"))
         
         self.status_label.setText(f"已添加 {len(files)} 个文件到书签列表。")
         self._update_controls_state()
@@ -1451,8 +1950,7 @@ class MainWindow(QMainWindow):
             output_path += '.pdf'
         self.merge_progress_bar.setValue(0)
         self._update_controls_state(is_task_running=True)
-        files = [self.merge_table.item(i, 0).data(Qt.ItemDataRole.UserRole) 
-                for i in range(self.merge_table.rowCount())]
+        files = self.merge_table.file_paths()
         
         engine = self.merge_engine_combo.currentText()
         self.merge_worker = MergeWorker(files, output_path, engine)
@@ -1464,12 +1962,14 @@ class MainWindow(QMainWindow):
         
     def on_merge_file_finished(self, row, result):
         if result.get("success"):
-            for r in range(self.merge_table.rowCount()):
-                 self.merge_table.setItem(r, 1, QTableWidgetItem("合并成功"))
+            with batched_table_update(self.merge_table):
+                for r in range(self.merge_table.rowCount()):
+                    self.merge_table.set_cell_text(r, 1, "合并成功")
             CustomMessageBox.information(self, "成功", f"文件已成功合并到:\n{result.get('output_path')}")
         else:
-            for r in range(self.merge_table.rowCount()):
-                self.merge_table.setItem(r, 1, QTableWidgetItem("合并失败"))
+            with batched_table_update(self.merge_table):
+                for r in range(self.merge_table.rowCount()):
+                    self.merge_table.set_cell_text(r, 1, "合并失败")
             error_message = result.get("message", "未知错误")
             CustomMessageBox.warning(self, "合并失败", f"合并失败：\n{error_message}")
     def _setup_optimize_tab(self):
@@ -1793,7 +2293,7 @@ class MainWindow(QMainWindow):
             dlg = BookmarkEditDialog(self, bookmarks=bookmarks)
             if dlg.exec() == QDialog.Accepted:
                 self._file_bookmarks[file_path] = dlg.get_bookmarks()
-                self.bookmark_file_table.setItem(row, 1, QTableWidgetItem(str(len(self._file_bookmarks[file_path]))))
+                self.bookmark_file_table.set_cell_text(row, 1, str(len(self._file_bookmarks[file_path])))
     def _extract_bookmarks_from_import(self, data):
         """从导入数据中提取书签列表，兼容多种格式"""
         # 格式1：纯列表 [{"page":1,"title":"xxx"}, ...]
@@ -1832,7 +2332,7 @@ class MainWindow(QMainWindow):
                 # 共用模式：设为共用书签
                 self._common_bookmarks = confirmed_bookmarks
                 for row in range(self.bookmark_file_table.rowCount()):
-                    self.bookmark_file_table.setItem(row, 1, QTableWidgetItem(str(len(confirmed_bookmarks))))
+                    self.bookmark_file_table.set_cell_text(row, 1, str(len(confirmed_bookmarks)))
             else:
                 # 独立模式：应用到当前选中的文件
                 if not hasattr(self, '_file_bookmarks'):
@@ -1846,7 +2346,7 @@ class MainWindow(QMainWindow):
                 for row in target_rows:
                     file_path = self.bookmark_file_table.item(row, 0).data(Qt.ItemDataRole.UserRole)
                     self._file_bookmarks[file_path] = confirmed_bookmarks
-                    self.bookmark_file_table.setItem(row, 1, QTableWidgetItem(str(len(confirmed_bookmarks))))
+                    self.bookmark_file_table.set_cell_text(row, 1, str(len(confirmed_bookmarks)))
             CustomMessageBox.information(self, "导入成功", f"已导入 {len(confirmed_bookmarks)} 条书签。")
         except Exception as e:
             CustomMessageBox.warning(self, "导入失败", f"导入书签配置失败：{str(e)}")
@@ -1884,11 +2384,9 @@ class MainWindow(QMainWindow):
             CustomMessageBox.warning(self, "警告", "请先选择要添加书签的PDF文件。")
             return
         # 获取所有文件路径和它们的目录
-        file_paths = []
+        file_paths = self.bookmark_file_table.file_paths()
         output_dir = None
-        for row in range(self.bookmark_file_table.rowCount()):
-            file_path = self.bookmark_file_table.item(row, 0).data(Qt.ItemDataRole.UserRole)
-            file_paths.append(file_path)
+        for file_path in file_paths:
             if output_dir is None:
                 output_dir = os.path.dirname(file_path)
             elif output_dir != os.path.dirname(file_path):
@@ -1922,15 +2420,13 @@ class MainWindow(QMainWindow):
     def on_bookmark_file_finished(self, row, result):
         """处理单个文件的书签添加结果"""
         if result.get("success"):
-            self.bookmark_file_table.setItem(row, 2, QTableWidgetItem("添加成功"))
             # 显示输出文件路径
             output_path = result.get("output", "")
-            if output_path:
-                self.bookmark_file_table.item(row, 2).setToolTip(f"已保存到：{output_path}")
+            self.bookmark_file_table.set_cell_text(row, 2, "添加成功").setToolTip(
+                f"已保存到：{output_path}" if output_path else "")
         else:
-            self.bookmark_file_table.setItem(row, 2, QTableWidgetItem("添加失败"))
             error_message = result.get("message", "未知错误")
-            self.bookmark_file_table.item(row, 2).setToolTip(error_message)
+            self.bookmark_file_table.set_cell_text(row, 2, "添加失败").setToolTip(error_message)
             CustomMessageBox.warning(
                 self, 
                 "添加失败", 
@@ -1964,7 +2460,7 @@ class MainWindow(QMainWindow):
             dlg = BookmarkEditDialog(self, bookmarks=bookmarks, is_new=True)
             if dlg.exec() == QDialog.Accepted:
                 self._file_bookmarks[file_path] = dlg.get_bookmarks()
-                self.bookmark_file_table.setItem(row, 1, QTableWidgetItem(str(len(self._file_bookmarks[file_path]))))
+                self.bookmark_file_table.set_cell_text(row, 1, str(len(self._file_bookmarks[file_path])))
     def add_files_to_ocr(self, files):
         if not files:
             return
@@ -1973,8 +2469,8 @@ class MainWindow(QMainWindow):
 
         file_path = files[0]  # 只取第一个文件
         self.ocr_table.setRowCount(1)
-        self.ocr_table.setItem(0, 0, QTableWidgetItem(os.path.basename(file_path)))
-        self.ocr_table.setItem(0, 1, QTableWidgetItem("等待中..."))
+        self.ocr_table.set_cell_text(0, 0, os.path.basename(file_path))
+        self.ocr_table.set_cell_text(0, 1, "等待中...")
         self.ocr_table.item(0, 0).setData(Qt.ItemDataRole.UserRole, file_path)
         
         self.status_label.setText(f"已添加文件: {os.path.basename(file_path)}")
@@ -2071,8 +2567,7 @@ class MainWindow(QMainWindow):
         ocr_layout.addLayout(bottom_controls_layout)
     def _load_config(self):
         self.env_path = os.path.join(os.path.expanduser("~"), ".pdfoptimizer", ".env")
-        if not os.path.exists(os.path.dirname(self.env_path)):
-             os.makedirs(os.path.dirname(self.env_path))
+        os.makedirs(os.path.dirname(self.env_path), exist_ok=True)
         dotenv.load_dotenv(dotenv_path=self.env_path)
 
     def _save_config(self):
@@ -2124,7 +2619,7 @@ class MainWindow(QMainWindow):
             temp_dir=self.temp_dir
         )
         self.ocr_worker.total_progress.connect(self.ocr_progress_bar.setAnimatedValue)
-        self.ocr_worker.ocr_progress.connect(lambda msg: self.ocr_table.setItem(0, 1, QTableWidgetItem(msg)))
+        self.ocr_worker.ocr_progress.connect(lambda msg: self.ocr_table.set_cell_text(0, 1, msg))
         self.ocr_worker.preview_updated.connect(self._update_preview_with_scroll)  # 连接预览更新信号
         self.ocr_worker.log_message.connect(self._append_log_with_scroll)  # 连接日志信号到日志显示区域
         self.ocr_worker.ocr_finished.connect(self.on_ocr_finished)
@@ -2141,7 +2636,7 @@ class MainWindow(QMainWindow):
             logger.info(f"接收到OCR结果，模型: {model_name}, 原始内容长度: {len(markdown_content)} 字符。")
             
             self.ocr_result_text.setPlainText(markdown_content)
-            self.ocr_table.setItem(0, 1, QTableWidgetItem("识别成功"))
+            self.ocr_table.set_cell_text(0, 1, "识别成功")
             
             # 获取文件路径信息
             try:
@@ -2239,7 +2734,7 @@ class MainWindow(QMainWindow):
         
         else:
             error_message = result.get("message", "未知错误")
-            self.ocr_table.setItem(0, 1, QTableWidgetItem("识别失败"))
+            self.ocr_table.set_cell_text(0, 1, "识别失败")
             self.ocr_result_text.setText(f"发生错误:\n{error_message}")
             CustomMessageBox.warning(self, "识别失败", f"OCR处理失败:\n{error_message}")
             self.status_label.setText("OCR识别失败。")
@@ -1,15 +1,18 @@
 import sys
 import os
+import logging
 
 from PySide6.QtWidgets import (
     QDialog, QVBoxLayout, QHBoxLayout, QFormLayout, QLineEdit, QTextEdit,
     QPushButton, QComboBox, QMessageBox, QApplication, QWidget, QSlider
 )
 from PySide6.QtCore import Qt, QThread, Signal
-from PySide6.QtGui import QIcon
+from .custom_dialog import app_icon
 import httpx
 import dotenv
 
+logger = logging.getLogger(__name__)
+
 # 尝试导入主窗口的资源路径函数
 try:
     from .main_window import resource_path
@@ -69,7 +72,9 @@ class OcrConfigDialog(QDialog):
         self.previous_provider_index = 0 # 用于跟踪切换前的提供商
 
         self.setWindowTitle("OCR 配置")
-        self.setWindowIcon(QIcon(resource_path("ui/app.ico"))) # 尝试设置图标
+        icon = app_icon() # 尝试设置图标，复用进程内共享的 QIcon
+        if icon is not None:
+            self.setWindowIcon(icon)
         self.setFixedSize(500, 400)  # 设置一个固定大小
         
         self._setup_ui()
@@ -235,7 +240,7 @@ class OcrConfigDialog(QDialog):
                         self.model_name_combo.insertItem(0, current_model)
                         self.model_name_combo.setCurrentText(current_model)
             except Exception as e:
-                print(f"加载模型列表失败: {e}")  # 静默处理，不打扰用户
+                logger.warning("加载模型列表失败: %s", e)  # 静默处理，不打扰用户
         else:
             # 如果没有保存的模型列表，添加一些常见的模型名称作为默认选项
             common_models = ["gpt-4o", "gpt-4o-mini", "claude-3-5-sonnet", "glm-4v"]
@@ -294,7 +299,7 @@ class OcrConfigDialog(QDialog):
                     # 尝试从.env文件中删除旧键
                     dotenv.unset_key(self.env_path, "OCR_MODEL_NAME")
                 except Exception as e:
-                    print(f"无法移除旧的 OCR_MODEL_NAME 键: {e}") # 记录错误但不影响用户
+                    logger.warning("无法移除旧的 OCR_MODEL_NAME 键: %s", e) # 记录错误但不影响用户
 
             QMessageBox.information(self, "成功", "OCR配置已成功保存。")
             return True
@@ -402,7 +407,7 @@ class OcrConfigDialog(QDialog):
                     if models:
                         self.model_name_combo.addItems(models)
                 except Exception as e:
-                    print(f"加载模型列表失败: {e}")
+                    logger.warning("加载模型列表失败: %s", e)
             else:
                 common_models = ["gpt-4o", "gpt-4o-mini", "claude-3-5-sonnet", "glm-4v"]
                 self.model_name_combo.addItems(common_models)
@@ -456,7 +461,7 @@ class OcrConfigDialog(QDialog):
                 with open(self.models_path, 'w', encoding='utf-8') as f:
                     f.write('\n'.join(models))
             except Exception as e:
-                print(f"保存模型列表失败: {e}")  # 静默处理，不打扰用户
+                logger.warning("保存模型列表失败: %s", e)  # 静默处理，不打扰用户
                 
             QMessageBox.information(self, "成功", f"成功获取到 {len(models)} 个模型。\n\n可用模型列表已更新，您可以从下拉菜单中选择合适的模型。")
         else: